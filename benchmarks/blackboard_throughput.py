@@ -0,0 +1,55 @@
+"""
+Measures how many messages per second go through the Blackboard with each
+backend, every message being written and then read back, like the
+directions sent by the moderator to the players.
+
+Usage: python -m benchmarks.blackboard_throughput [--messages N] [--keys N]
+"""
+
+import argparse
+import time
+
+from src.blackboard import Blackboard
+from src.blackboard_backends import (
+    LocalBlackboardBackend,
+    ManagerBlackboardBackend,
+    SharedMemoryBlackboardBackend,
+)
+from src.geometry import Vector2D
+
+
+def messages_per_second(blackboard: Blackboard, messages: int, keys: int) -> float:
+    message = Vector2D(x=0.6, y=-0.8)
+    key_names = [f"player-{idx}" for idx in range(keys)]
+
+    start = time.perf_counter()
+    for idx in range(messages):
+        key = key_names[idx % keys]
+        blackboard.write(key, message)
+        blackboard.read(key)
+    return messages / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--keys", type=int, default=16)
+    args = parser.parse_args()
+
+    backends = {
+        "manager": ManagerBlackboardBackend,
+        "shared-memory": SharedMemoryBlackboardBackend,
+        "local": LocalBlackboardBackend,
+    }
+    print(f"{'backend':<16}{'messages/s':>14}")
+    for name, backend_cls in backends.items():
+        blackboard = Blackboard(backend=backend_cls())
+        try:
+            rate = messages_per_second(blackboard, args.messages, args.keys)
+        finally:
+            blackboard.close()
+        print(f"{name:<16}{rate:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Measures how the engine scales with the size of the map and the number of
+agents, on procedurally generated maps (see src.map_generator). For every
+map size and agent count, reports the time taken to set up the state, the
+mean time of a tick with every agent acting at random, and the part of it
+spent casting rays.
+
+Usage: python -m benchmarks.scaling [--sizes N [N ...]] [--agents N [N ...]]
+       [--teams N] [--ticks N] [--seed N] [--ray-caster {marcher,numpy,grid}]
+       [--output FILE]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.environment import GameEnvironment
+from src.map_generator import generate_map
+from src.profiler import TickProfiler
+from src.state import GameState
+
+from .suite import DEFAULT_RAY_CASTER, RAY_CASTERS, random_match
+
+
+def measure(
+    size: int, num_agents: int, num_teams: int, ticks: int, seed: int, ray_caster: str
+) -> dict[str, float]:
+    """
+    Returns the setup time and the mean tick and ray casting times, in
+    milliseconds, of a size x size map with num_agents agents.
+    """
+    game_map = generate_map(
+        size,
+        size,
+        num_teams=num_teams,
+        players_per_team=num_agents // num_teams,
+        seed=seed,
+    )
+    start = time.perf_counter()
+    env = GameEnvironment(
+        state=GameState(map=game_map, ray_caster=RAY_CASTERS[ray_caster]())
+    )
+    setup = time.perf_counter() - start
+
+    profiler = TickProfiler(window=ticks)
+    env.state.profiler = profiler
+    tick_times = []
+    start = time.perf_counter()
+    profiler.begin_tick()
+    for _ in random_match(env, ticks, seed):
+        now = time.perf_counter()
+        tick_times.append(now - start)
+        profiler.begin_tick()
+        start = time.perf_counter()
+    profiler.end_tick()
+
+    percentiles = profiler.percentiles((50,))
+    return {
+        "setup_ms": setup * 1e3,
+        "tick_ms": float(np.mean(tick_times)) * 1e3,
+        "rays_ms": percentiles.get("rays", {"p50": 0.0})["p50"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 500])
+    parser.add_argument("--agents", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--teams", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ray-caster", choices=RAY_CASTERS, default=DEFAULT_RAY_CASTER)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {}
+    print(
+        f"{'map':>9}{'agents':>8}{'setup (ms)':>12}{'tick (ms)':>12}{'rays (ms)':>12}"
+    )
+    for size in args.sizes:
+        for num_agents in args.agents:
+            name = f"{size}x{size}/{num_agents}"
+            try:
+                result = measure(
+                    size, num_agents, args.teams, args.ticks, args.seed, args.ray_caster
+                )
+            except ValueError as e:
+                print(f"{size:>4}x{size:<4}{num_agents:>8}  skipped: {e}")
+                continue
+            results[name] = result
+            print(
+                f"{size:>4}x{size:<4}{num_agents:>8}{result['setup_ms']:>12.1f}"
+                f"{result['tick_ms']:>12.2f}{result['rays_ms']:>12.2f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "metadata": {
+                        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                        "ray_caster": args.ray_caster,
+                        "teams": args.teams,
+                        "ticks": args.ticks,
+                        "seed": args.seed,
+                    },
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measures the per-tick cost of selecting the actions of a group of no-op
+agents with each scheduler, i.e. the overhead the scheduler itself adds on
+top of the agents' work.
+
+Usage: python -m benchmarks.scheduler_overhead [--agents N] [--ticks N]
+"""
+
+import argparse
+import time
+
+from src.interfaces.action import Action
+from src.interfaces.agent import Agent
+from src.interfaces.environment import Environment
+from src.interfaces.percept import Percept
+from src.interfaces.state import State
+from src.simulations import (
+    Scheduler,
+    SequentialScheduler,
+    ThreadPerAgentScheduler,
+    ThreadPoolScheduler,
+)
+
+
+class NoopPercept(Percept):
+    pass
+
+
+class NoopAction(Action):
+    pass
+
+
+class NoopState(State):
+    pass
+
+
+class NoopAgent(Agent):
+    def see(self, percept: Percept):
+        pass
+
+    def select_action(self) -> Action:
+        return NoopAction()
+
+
+class NoopEnvironment(Environment):
+    def get_percept(self, agent: Agent) -> Percept:
+        return NoopPercept()
+
+    def update_state(self, agent: Agent, action: Action) -> None:
+        pass
+
+
+def time_scheduler(scheduler: Scheduler, num_agents: int, ticks: int) -> float:
+    agents = [NoopAgent() for _ in range(num_agents)]
+    env = NoopEnvironment(state=NoopState())
+    scheduler.select_actions(agents, env)
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        scheduler.select_actions(agents, env)
+    elapsed = time.perf_counter() - start
+    scheduler.shutdown()
+    return elapsed / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--agents", type=int, default=16)
+    parser.add_argument("--ticks", type=int, default=500)
+    args = parser.parse_args()
+
+    schedulers = {
+        "thread-per-agent": ThreadPerAgentScheduler(),
+        "thread-pool": ThreadPoolScheduler(),
+        "sequential": SequentialScheduler(),
+    }
+    times = {
+        name: time_scheduler(scheduler, args.agents, args.ticks)
+        for name, scheduler in schedulers.items()
+    }
+
+    reference = times["thread-per-agent"]
+    print(f"{'scheduler':<18}{'per tick':>12}{'saved':>12}{'speedup':>10}")
+    for name, per_tick in times.items():
+        print(
+            f"{name:<18}{per_tick * 1e6:>10.1f}us"
+            f"{(reference - per_tick) * 1e6:>10.1f}us"
+            f"{reference / per_tick:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Benchmark suite guarding the simulation against performance regressions.
+Measures the ticks per second of every map in maps/ at several agent
+counts, and microbenchmarks of the hot paths: single ray marching, shot
+resolution, wall lookups, Vector2D operations and Blackboard I/O. Every
+result is a rate, higher being better, and the best of several repeats.
+
+The results are written as JSON. Given a baseline written by a previous
+run, the suite compares against it and exits with status 1 when a result
+is slower than the baseline by more than the tolerance.
+
+Usage: python -m benchmarks.suite [--output FILE] [--baseline FILE]
+       [--tolerance FRACTION] [--agents N [N ...]] [--ticks N]
+       [--repeat N] [--ray-caster {marcher,numpy,grid}] [--only PREFIX]
+"""
+
+import argparse
+import functools
+import glob
+import json
+import os
+import platform
+import random
+import sys
+import time
+from typing import Callable, Iterator
+
+import numpy as np
+
+from src.actions import ACTION_TYPES
+from src.agents.player import PlayerAgent
+from src.blackboard import Blackboard
+from src.blackboard_backends import (
+    LocalBlackboardBackend,
+    SharedMemoryBlackboardBackend,
+)
+from src.constants import PLAYER_SHOOTING_LENGTH_PER_TICK
+from src.environment import GameEnvironment
+from src.geometry import FastVector2D, Vector2D
+from src.map import GameMap
+from src.projectiles import ProjectileSystem
+from src.ray_casters import GridTraversalRayCaster, NumpyRayCaster
+from src.state import AGENT_QUERY_RADIUS, GameState
+
+from .blackboard_throughput import messages_per_second
+from .vector2d_ops import OPERATIONS, time_operations
+
+RAY_CASTERS = {
+    "marcher": lambda: None,
+    "numpy": NumpyRayCaster,
+    "grid": GridTraversalRayCaster,
+}
+# The one of GameState, so that the engine is measured as it ships
+DEFAULT_RAY_CASTER = "marcher"
+TEAMS = "RBGY"
+
+
+def populated_map(path: str, num_agents: int, seed: int = 0) -> GameMap:
+    """
+    Loads the map at path with its players replaced by num_agents agents,
+    split between TEAMS and placed on random free cells. Maps with fewer
+    free cells get one agent per cell.
+    """
+    game_map = GameMap.from_file(path)
+    grid = [row[1:-1] for row in game_map.grid[1:-1]]
+    free_cells = [
+        (x, y)
+        for y, row in enumerate(grid)
+        for x, cell in enumerate(row)
+        if cell == "."
+    ]
+    cells = random.Random(seed).sample(free_cells, min(num_agents, len(free_cells)))
+    for idx, (x, y) in enumerate(cells):
+        grid[y][x] = TEAMS[idx % len(TEAMS)]
+    return GameMap(grid)
+
+
+def best_rate(run: Callable[[], int], repeat: int) -> float:
+    """
+    Runs the benchmark repeat times and returns the best number of
+    operations per second, run returning the number of operations it did.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operations = run()
+        best = max(best, operations / (time.perf_counter() - start))
+    return best
+
+
+def random_match(
+    env: GameEnvironment, ticks: int, seed: int = 0
+) -> Iterator[GameEnvironment]:
+    """
+    Plays ticks ticks of the environment with every agent acting at random,
+    yielding after each one.
+    """
+    players = [
+        PlayerAgent.model_construct(player_id=player_id)
+        for player_id in env.state.agent_stats
+    ]
+    rng = random.Random(seed)
+    for _ in range(ticks):
+        for player in players:
+            env.update_state(player, rng.choice(ACTION_TYPES)())
+        env.step()
+        yield env
+
+
+def ticks_per_second(
+    path: str, num_agents: int, ticks: int, repeat: int, ray_caster: str
+) -> float:
+    """
+    Only the ticks are timed, loading the map and setting up the state are
+    left out.
+    """
+    best = 0.0
+    for _ in range(repeat):
+        game_map = populated_map(path, num_agents)
+        env = GameEnvironment(
+            state=GameState(map=game_map, ray_caster=RAY_CASTERS[ray_caster]())
+        )
+        match = random_match(env, ticks)
+        start = time.perf_counter()
+        for _ in match:
+            pass
+        best = max(best, ticks / (time.perf_counter() - start))
+    return best
+
+
+def cast_single_ray(repeat: int) -> float:
+    state = GameState(map=populated_map("maps/level_tactical.txt", 16))
+    stats = list(state.agent_stats.values())
+    rays = []
+    for agent_stats in stats:
+        origin = FastVector2D.from_model(agent_stats.map_data.position)
+        nearby = state._indexed_agents(
+            state.spatial_index.query_point(origin.x, origin.y, AGENT_QUERY_RADIUS)
+        )
+        for angle in range(0, 360, 10):
+            rays.append(
+                (origin, FastVector2D.from_angle(angle), agent_stats.map_data, nearby)
+            )
+
+    def run() -> int:
+        for ray in rays:
+            state._cast_single_ray(*ray)
+        return len(rays)
+
+    return best_rate(run, repeat)
+
+
+def resolve_shots(repeat: int) -> float:
+    state = GameState(map=populated_map("maps/level_tactical.txt", 16))
+    agents = state.agents
+    rng = np.random.default_rng(0)
+    num_shots = 256
+    shooters = rng.integers(len(agents), size=num_shots)
+    angles = rng.uniform(0, 2 * np.pi, size=num_shots)
+    directions = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    origins = agents.positions[shooters]
+
+    def run() -> int:
+        for _ in range(20):
+            ProjectileSystem.resolve(
+                state.map.wall_mask,
+                state.spatial_index,
+                agents.positions,
+                agents.alive.copy(),
+                origins,
+                directions,
+                shooters,
+                PLAYER_SHOOTING_LENGTH_PER_TICK,
+            )
+        return 20 * num_shots
+
+    return best_rate(run, repeat)
+
+
+def nearest_walls(repeat: int) -> float:
+    game_map = GameMap.from_file("maps/level_tactical.txt")
+    rng = random.Random(0)
+    points = [
+        Vector2D(x=rng.uniform(0, game_map.width), y=rng.uniform(0, game_map.height))
+        for _ in range(2_000)
+    ]
+
+    def run() -> int:
+        for point in points:
+            game_map.nearest_walls(point)
+        return len(points)
+
+    return best_rate(run, repeat)
+
+
+@functools.cache
+def vector_operations(vector_cls, repeat: int) -> dict[str, float]:
+    timings = [time_operations(vector_cls, 20_000) for _ in range(repeat)]
+    return {
+        operation: 1 / min(timing[operation] for timing in timings)
+        for operation in OPERATIONS
+    }
+
+
+def blackboard_io(backend_cls, repeat: int) -> float:
+    blackboard = Blackboard(backend=backend_cls())
+    try:
+        return max(
+            messages_per_second(blackboard, messages=5_000, keys=16)
+            for _ in range(repeat)
+        )
+    finally:
+        blackboard.close()
+
+
+def run_suite(args) -> dict[str, float]:
+    benchmarks: dict[str, Callable[[], float]] = {}
+    for path in sorted(glob.glob("maps/*.txt")):
+        map_name = os.path.splitext(os.path.basename(path))[0]
+        for num_agents in args.agents:
+            benchmarks[f"ticks/{map_name}/{num_agents}"] = (
+                lambda path=path, num_agents=num_agents: ticks_per_second(
+                    path, num_agents, args.ticks, args.repeat, args.ray_caster
+                )
+            )
+
+    benchmarks["micro/cast_single_ray"] = lambda: cast_single_ray(args.repeat)
+    benchmarks["micro/resolve_shots"] = lambda: resolve_shots(args.repeat)
+    benchmarks["micro/nearest_walls"] = lambda: nearest_walls(args.repeat)
+    for vector_cls in (Vector2D, FastVector2D):
+        for operation in OPERATIONS:
+            benchmarks[f"micro/{vector_cls.__name__}.{operation}"] = (
+                lambda vector_cls=vector_cls, operation=operation: vector_operations(
+                    vector_cls, args.repeat
+                )[operation]
+            )
+    benchmarks["micro/blackboard/local"] = lambda: blackboard_io(
+        LocalBlackboardBackend, args.repeat
+    )
+    benchmarks["micro/blackboard/shared-memory"] = lambda: blackboard_io(
+        SharedMemoryBlackboardBackend, args.repeat
+    )
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        if args.only and not name.startswith(args.only):
+            continue
+        results[name] = benchmark()
+        print(f"{name:<40}{results[name]:>16,.1f}/s")
+    return results
+
+
+def compare(
+    results: dict[str, float], baseline: dict[str, float], tolerance: float
+) -> list[str]:
+    """
+    Prints the change of every result present in the baseline and returns
+    the names of the ones that regressed by more than the tolerance.
+    """
+    regressions = []
+    print(f"\n{'benchmark':<40}{'baseline':>14}{'current':>14}{'change':>9}")
+    for name, value in results.items():
+        if name not in baseline:
+            continue
+        change = value / baseline[name] - 1
+        regressed = change < -tolerance
+        if regressed:
+            regressions.append(name)
+        print(
+            f"{name:<40}{baseline[name]:>14,.1f}{value:>14,.1f}{change:>+8.1%}"
+            f"{'  REGRESSION' if regressed else ''}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--agents", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--ticks", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--ray-caster", choices=RAY_CASTERS, default=DEFAULT_RAY_CASTER)
+    parser.add_argument("--only", help="only run the benchmarks with this prefix")
+    args = parser.parse_args()
+
+    results = run_suite(args)
+    with open(args.output, "w") as f:
+        json.dump(
+            {
+                "metadata": {
+                    "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "ray_caster": args.ray_caster,
+                    "ticks": args.ticks,
+                },
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        baseline_caster = baseline["metadata"]["ray_caster"]
+        if baseline_caster != args.ray_caster:
+            sys.exit(
+                f"The baseline was measured with the {baseline_caster} ray "
+                f"caster, not {args.ray_caster}."
+            )
+        regressions = compare(results, baseline["results"], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed beyond the tolerance.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compares the per-operation cost of the pydantic Vector2D with the slotted
+FastVector2D used in the hot paths.
+
+Usage: python -m benchmarks.vector2d_ops [--number N]
+"""
+
+import argparse
+import timeit
+
+from src.geometry import FastVector2D, Vector2D
+
+
+OPERATIONS = {
+    "add": "a + b",
+    "sub": "a - b",
+    "mul": "a * 0.5",
+    "versor": "a.versor()",
+    "rotate": "a.rotate(15)",
+    "from_angle": "cls.from_angle(15)",
+}
+
+
+def time_operations(vector_cls, number: int) -> dict[str, float]:
+    namespace = {
+        "cls": vector_cls,
+        "a": vector_cls(x=1.5, y=-2.0),
+        "b": vector_cls(x=0.25, y=3.0),
+    }
+    return {
+        name: timeit.timeit(statement, globals=namespace, number=number) / number
+        for name, statement in OPERATIONS.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    model_times = time_operations(Vector2D, args.number)
+    fast_times = time_operations(FastVector2D, args.number)
+
+    print(f"{'operation':<12}{'Vector2D':>12}{'FastVector2D':>14}{'speedup':>10}")
+    for name in OPERATIONS:
+        model_ns = model_times[name] * 1e9
+        fast_ns = fast_times[name] * 1e9
+        print(
+            f"{name:<12}{model_ns:>10.0f}ns{fast_ns:>12.0f}ns"
+            f"{model_ns / fast_ns:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,15 @@ from .actions import (
     ShootAction,
     WaitAction,
 )
+from .action_codes import (
+    ACTION_TYPES,
+    FORWARD,
+    SHOOT,
+    TURN_LEFT,
+    TURN_RIGHT,
+    WAIT,
+    action_code,
+)
 from .forward_executor import ForwardExecutor
 from .rotate_executors import TurnLeftExecutor, TurnRightExecutor
 from .shoot_executor import ShootExecutor
@@ -18,4 +27,11 @@ __all__ = [
     "TurnRightAction",
     "ShootAction",
     "WaitAction",
+    "ACTION_TYPES",
+    "FORWARD",
+    "SHOOT",
+    "TURN_LEFT",
+    "TURN_RIGHT",
+    "WAIT",
+    "action_code",
 ]
@@ -0,0 +1,24 @@
+from .actions import (
+    PlayerAction,
+    ForwardAction,
+    ShootAction,
+    TurnLeftAction,
+    TurnRightAction,
+    WaitAction,
+)
+
+# The integer code of an action is its index in this tuple
+ACTION_TYPES: tuple[type[PlayerAction], ...] = (
+    WaitAction,
+    ForwardAction,
+    TurnLeftAction,
+    TurnRightAction,
+    ShootAction,
+)
+WAIT, FORWARD, TURN_LEFT, TURN_RIGHT, SHOOT = range(len(ACTION_TYPES))
+
+_ACTION_CODES = {action_type: code for code, action_type in enumerate(ACTION_TYPES)}
+
+
+def action_code(action: PlayerAction) -> int:
+    return _ACTION_CODES[type(action)]
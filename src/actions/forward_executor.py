@@ -1,7 +1,8 @@
 from src.agents.player import PlayerAgent
 from src.constants import PLAYER_FORWARD_DISTANCE
+from src.geometry import FastVector2D
 from src.interfaces import ExecutableAction
-from src.objects import CollisionDetector
+from src.objects import PLAYER_DIAMETER
 from src.state import GameState
 from src.utils import ActionExecutorFactory
 
@@ -18,12 +19,10 @@ class ForwardExecutor(ExecutableAction):
         if dir_vec is None:
             return state
 
-        new_pos = stats.map_data.position + dir_vec * PLAYER_FORWARD_DISTANCE
-        if all(
-            not CollisionDetector.check_collision_player_wall(new_pos, wall)
-            for wall in state.map.nearest_walls(new_pos)
-        ):
-            stats.map_data.position = new_pos
+        position = FastVector2D.from_model(stats.map_data.position)
+        new_pos = position + FastVector2D.from_model(dir_vec) * PLAYER_FORWARD_DISTANCE
+        if not state.map.circle_hits_wall(new_pos.x, new_pos.y, PLAYER_DIAMETER / 2):
+            stats.map_data.position = new_pos.to_model()
 
         return state
 
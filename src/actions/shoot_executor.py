@@ -1,5 +1,6 @@
 from src.agents.player import PlayerAgent
-from src.geometry import Vector2D
+from src.geometry import FastVector2D
+from src.headings import HEADING_ANGLES, heading_vector
 from src.interfaces import ExecutableAction
 from src.state import GameState, PendingShot
 
@@ -14,13 +15,17 @@ class ShootExecutor(ExecutableAction):
         if not stats.is_alive or stats.shooting_delay > 0:
             return state
 
-        origin = stats.map_data.position
+        # Shots are moved in place, so they must not share the player's vector
+        origin = stats.map_data.position.model_copy()
         if not stats.map_data.direction:
             return state
 
-        base_angle = stats.map_data.direction.base_angle()
-        shot_angle = base_angle + self.action.angle
-        direction = Vector2D.from_angle(shot_angle)
+        heading = stats.map_data.heading
+        if self.action.angle == 0:
+            direction = heading_vector(heading)
+        else:
+            shot_angle = HEADING_ANGLES[heading] + self.action.angle
+            direction = FastVector2D.from_angle(shot_angle).to_model()
 
         state.pending_shots.append(
             PendingShot(player_id=agent.player_id, origin=origin, direction=direction)
@@ -0,0 +1,126 @@
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .map import PlayerID
+
+# Heading of the agents without a direction
+NO_HEADING = -1
+
+if TYPE_CHECKING:
+    from .state import AgentStats
+
+
+class AgentStore:
+    """
+    Struct-of-arrays storage of the per-agent data of a GameState. Agents are
+    addressed by their integer index, every attribute is a contiguous array
+    indexed by it, so bulk updates and copies run on packed memory instead of
+    one pydantic model per agent.
+    """
+
+    ARRAYS = (
+        "team",
+        "positions",
+        "directions",
+        "headings",
+        "alive",
+        "shooting_delay",
+        "kills",
+    )
+
+    def __init__(self, player_ids: list[PlayerID], teams: list[str]):
+        num_agents = len(player_ids)
+        self.player_ids = list(player_ids)
+        self.index = {player_id: idx for idx, player_id in enumerate(player_ids)}
+
+        team_names, team = np.unique(np.array(teams, dtype=str), return_inverse=True)
+        self.team_names: list[str] = team_names.tolist()
+        self.team = team.astype(np.int16).reshape(num_agents)
+
+        self.positions = np.zeros((num_agents, 2))
+        self.directions = np.full((num_agents, 2), np.nan)
+        self.headings = np.full(num_agents, NO_HEADING, dtype=np.intp)
+        self.alive = np.ones(num_agents, dtype=bool)
+        self.shooting_delay = np.zeros(num_agents, dtype=np.int32)
+        self.kills = np.zeros(num_agents, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.player_ids)
+
+    @classmethod
+    def from_agent_stats(
+        cls, agent_stats: dict[PlayerID, "AgentStats"]
+    ) -> "AgentStore":
+        store = cls(
+            list(agent_stats.keys()),
+            [stats.map_data.team for stats in agent_stats.values()],
+        )
+        store.pull(agent_stats)
+        return store
+
+    def pull(self, agent_stats: dict[PlayerID, "AgentStats"]):
+        """
+        Reads the current values of the agent models into the arrays, one
+        list per attribute, so each array is written in a single operation.
+        """
+        stats = list(agent_stats.values())
+        map_data = [agent.map_data for agent in stats]
+        self.positions[:] = [(data.position.x, data.position.y) for data in map_data]
+        directions = np.array(
+            [
+                (
+                    (np.nan, np.nan)
+                    if data.direction is None
+                    else (data.direction.x, data.direction.y)
+                )
+                for data in map_data
+            ]
+        ).reshape(len(stats), 2)
+        # Only the agents that turned need their heading looked up again
+        turned = np.flatnonzero((directions != self.directions).any(axis=-1))
+        self.directions[:] = directions
+        for idx in turned.tolist():
+            heading = map_data[idx].heading
+            self.headings[idx] = NO_HEADING if heading is None else heading
+        self.alive[:] = [agent.is_alive for agent in stats]
+        self.shooting_delay[:] = [agent.shooting_delay for agent in stats]
+        self.kills[:] = [len(agent.kills) for agent in stats]
+        self._pulled_alive = self.alive.copy()
+        self._pulled_shooting_delay = self.shooting_delay.copy()
+
+    def push(self, agent_stats: dict[PlayerID, "AgentStats"]):
+        """
+        Writes the values updated in bulk (alive flags and shooting delays)
+        back into the agent models, for the agents whose values changed
+        since the last pull.
+        """
+        changed = np.flatnonzero(
+            (self.alive != self._pulled_alive)
+            | (self.shooting_delay != self._pulled_shooting_delay)
+        )
+        if len(changed) == 0:
+            return
+        stats = list(agent_stats.values())
+        for idx, alive, shooting_delay in zip(
+            changed.tolist(),
+            self.alive[changed].tolist(),
+            self.shooting_delay[changed].tolist(),
+        ):
+            stats[idx].is_alive = alive
+            stats[idx].shooting_delay = shooting_delay
+
+    def tick_cooldowns(self):
+        np.subtract(self.shooting_delay, 1, out=self.shooting_delay)
+        np.maximum(self.shooting_delay, 0, out=self.shooting_delay)
+
+    def copy(self) -> "AgentStore":
+        other = AgentStore.__new__(AgentStore)
+        other.player_ids = list(self.player_ids)
+        other.index = dict(self.index)
+        other.team_names = list(self.team_names)
+        for name in self.ARRAYS:
+            setattr(other, name, getattr(self, name).copy())
+        other._pulled_alive = self._pulled_alive.copy()
+        other._pulled_shooting_delay = self._pulled_shooting_delay.copy()
+        return other
@@ -1,4 +1,6 @@
 import random
+from typing import ClassVar
+
 from src.actions import (
     PlayerAction,
     WaitAction,
@@ -14,6 +16,9 @@ from ..player import PlayerAgent
 
 
 class DummyPlayerAgent(PlayerAgent):
+    # Reads the Ray models of PlayerPercept
+    supports_observation_mode: ClassVar[bool] = False
+
     def _check_wall(self):
         if random.random() < 0.7 and any(
             [
@@ -1,11 +1,13 @@
 import random
 from abc import ABC
+from typing import ClassVar
 
 from src.actions import WaitAction
 from src.objects import GameObject, Ray
 from src.geometry import Vector2D
 from src.state import AgentStats
 from src.constants import VERBOSE
+from src.mailbox_policy import MailboxPolicy
 
 from .percept import ModeratorPercept
 from ..communication_agent import CommunicationAgent
@@ -16,6 +18,10 @@ class ModeratorAgent(CommunicationAgent, ABC):
     teams_notified: set = set()
     last_enemies: dict[str, str] = {}
     probability: float
+    # Players only act on the freshest direction, older ones are stale
+    mailbox_policy: MailboxPolicy = MailboxPolicy.latest()
+    # Reads the rays of the agent stats, left empty in observation mode
+    supports_observation_mode: ClassVar[bool] = False
 
     def see(self, percept: ModeratorPercept):
         self.current_percept = percept
@@ -33,6 +39,10 @@ class ModeratorAgent(CommunicationAgent, ABC):
 
         return relative_direction.versor()
 
+    def _send(self, player_id: str, direction: Vector2D):
+        self.blackboard.set_policy(player_id, self.mailbox_policy)
+        self.blackboard.write(player_id, direction)
+
     def _notify_teammates(
         self, player_id: str, player_stats: AgentStats, rays_hitting_enemy: list[Ray]
     ):
@@ -51,7 +61,7 @@ class ModeratorAgent(CommunicationAgent, ABC):
                 print(
                     f"[MOD]: Sending message to {other_id} from {player_id}. Enemy at relative direction {direction}."
                 )
-            self.blackboard.write(other_id, direction)
+            self._send(other_id, direction)
         self.teams_notified.add(team)
 
     def _notify_player_randomly(self, player_id: str, player_stats: AgentStats):
@@ -77,7 +87,7 @@ class ModeratorAgent(CommunicationAgent, ABC):
                 f"[MOD]: Sending message to {player_id} randomly. Enemy at relative direction {direction}."
             )
 
-        self.blackboard.write(player_id, direction)
+        self._send(player_id, direction)
 
     def select_action(self) -> WaitAction:
         if not self.current_percept or random.random() > self.probability:
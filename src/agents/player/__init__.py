@@ -1,4 +1,4 @@
 from .agent import PlayerAgent
-from .percept import PlayerPercept
+from .percept import PlayerObservationPercept, PlayerPercept
 
-__all__ = ["PlayerAgent", "PlayerPercept"]
+__all__ = ["PlayerAgent", "PlayerObservationPercept", "PlayerPercept"]
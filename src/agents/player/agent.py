@@ -1,26 +1,30 @@
 from abc import ABC
 from collections import deque
+from typing import ClassVar
 
 from src.actions import PlayerAction, WaitAction
 from src.constants import PLAYER_LAST_ACTIONS_LEN, VERBOSE
 from src.geometry import Vector2D
 
-from .percept import PlayerPercept
+from .percept import PlayerObservationPercept, PlayerPercept
 from ..communication_agent import CommunicationAgent
 
 
 class PlayerAgent(CommunicationAgent, ABC):
     player_id: str
     last_actions: deque[PlayerAction] = deque(maxlen=PLAYER_LAST_ACTIONS_LEN)
-    current_percept: PlayerPercept | None = None
+    current_percept: PlayerPercept | PlayerObservationPercept | None = None
     current_message: Vector2D | None = None
+    # Whether the agent can act on the PlayerObservationPercept it is given
+    # when GameState.observation_mode is on, instead of Ray models
+    supports_observation_mode: ClassVar[bool] = True
 
     def init(self, **kwargs):
         super().__init__(**kwargs)
         for _ in range(PLAYER_LAST_ACTIONS_LEN):
             self.last_actions.append(WaitAction())
 
-    def see(self, percept: PlayerPercept):
+    def see(self, percept: PlayerPercept | PlayerObservationPercept):
         self.current_percept = percept
         message = self.blackboard.read(self.player_id)
         if message is not None:
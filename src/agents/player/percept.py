@@ -1,6 +1,20 @@
+import numpy as np
+from pydantic import ConfigDict
+
 from src.objects import Ray
 from src.interfaces.percept import Percept
 
 
 class PlayerPercept(Percept):
     rays: list[Ray]
+
+
+class PlayerObservationPercept(Percept):
+    """
+    Percept of a player in observation mode: a view of its row of
+    GameState.observations, updated in place every tick.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    observation: np.ndarray  # (rays, OBSERVATION_FEATURES) float32
@@ -1,43 +1,42 @@
-from multiprocessing import synchronize
 from typing import Any
-import multiprocessing
 
-from pydantic import BaseModel, PrivateAttr
+from pydantic import BaseModel, ConfigDict, Field
+
+from .blackboard_backends import ManagerBlackboardBackend
+from .interfaces import BlackboardBackend
+from .mailbox_policy import MailboxPolicy
 
 
 class Blackboard(BaseModel):
-    model_config = {"arbitrary_types_allowed": True}
+    """
+    Mailboxes shared by the agents, one per key. Where the mailboxes live is
+    decided by the backend given at construction: a manager process by
+    default, which works across any processes, the memory of the current
+    process for single-process simulations, or a shared memory segment.
+
+    Each key keeps its messages according to its MailboxPolicy, set with
+    set_policy by the writers, and otherwise to the default policy.
+    """
 
-    _manager: multiprocessing.Manager = PrivateAttr()
-    _queues: dict = PrivateAttr()
-    _lock: multiprocessing.synchronize.Lock = PrivateAttr()
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._manager = multiprocessing.Manager()
-        self._queues = self._manager.dict()
-        self._lock = self._manager.Lock()
+    backend: BlackboardBackend = Field(default_factory=ManagerBlackboardBackend)
+    default_policy: MailboxPolicy = MailboxPolicy()
+    policies: dict[str, MailboxPolicy] = {}
 
-    def _ensure_queue(self, key: str):
-        with self._lock:
-            if key not in self._queues:
-                self._queues[key] = self._manager.list()
+    def set_policy(self, key: str, policy: MailboxPolicy):
+        self.policies[key] = policy
 
-    def write(self, key: str, message: Any):
-        self._ensure_queue(key)
-        with self._lock:
-            self._queues[key].append(message)
+    def write(self, key: str, message: Any, sender: str | None = None):
+        self.backend.write(
+            key, message, sender, self.policies.get(key, self.default_policy)
+        )
 
     def read(self, key: str):
-        self._ensure_queue(key)
-        with self._lock:
-            if not self._queues[key]:
-                return None
-            return self._queues[key].pop(0)
+        return self.backend.read(key)
 
     def read_all(self, key: str):
-        self._ensure_queue(key)
-        with self._lock:
-            items = list(self._queues[key])
-            self._queues[key].clear()
-            return items
+        return self.backend.read_all(key)
+
+    def close(self):
+        self.backend.close()
@@ -0,0 +1,9 @@
+from .local_blackboard_backend import LocalBlackboardBackend
+from .manager_blackboard_backend import ManagerBlackboardBackend
+from .shared_memory_blackboard_backend import SharedMemoryBlackboardBackend
+
+__all__ = [
+    "LocalBlackboardBackend",
+    "ManagerBlackboardBackend",
+    "SharedMemoryBlackboardBackend",
+]
@@ -0,0 +1,62 @@
+import itertools
+import threading
+from typing import Any, Hashable
+
+from src.interfaces import BlackboardBackend
+from src.mailbox_policy import DEFAULT_MAILBOX_POLICY, MailboxMode, MailboxPolicy
+
+
+class LocalBlackboardBackend(BlackboardBackend):
+    """
+    Keeps the mailboxes in the memory of the current process, for
+    simulations whose agents all run in it. Safe to use from several threads.
+
+    A mailbox is an insertion-ordered dict, keyed by sender when coalescing
+    and by a unique id otherwise, so every policy is applied in O(1).
+    """
+
+    def __init__(self):
+        self._mailboxes: dict[str, dict[Hashable, Any]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def write(
+        self,
+        key: str,
+        message: Any,
+        sender: str | None = None,
+        policy: MailboxPolicy = DEFAULT_MAILBOX_POLICY,
+    ):
+        with self._lock:
+            mailbox = self._mailboxes.get(key)
+            if mailbox is None:
+                mailbox = self._mailboxes[key] = {}
+
+            if policy.mode == MailboxMode.LATEST:
+                mailbox.clear()
+            if policy.mode == MailboxMode.LATEST_PER_SENDER:
+                # Moves the sender to the end, as its message is now the newest
+                mailbox.pop(("sender", sender), None)
+                mailbox[("sender", sender)] = message
+            else:
+                mailbox[next(self._ids)] = message
+
+            if policy.max_size is not None:
+                while len(mailbox) > policy.max_size:
+                    del mailbox[next(iter(mailbox))]
+
+    def read(self, key: str) -> Any | None:
+        with self._lock:
+            mailbox = self._mailboxes.get(key)
+            if not mailbox:
+                return None
+            return mailbox.pop(next(iter(mailbox)))
+
+    def read_all(self, key: str) -> list[Any]:
+        with self._lock:
+            mailbox = self._mailboxes.get(key)
+            if not mailbox:
+                return []
+            messages = list(mailbox.values())
+            mailbox.clear()
+            return messages
@@ -0,0 +1,67 @@
+import multiprocessing
+from multiprocessing import synchronize
+from typing import Any
+
+from src.interfaces import BlackboardBackend
+from src.mailbox_policy import DEFAULT_MAILBOX_POLICY, MailboxMode, MailboxPolicy
+
+
+class ManagerBlackboardBackend(BlackboardBackend):
+    """
+    Keeps the mailboxes in a multiprocessing manager server process, so
+    that they can be shared with any process. Every operation is a round
+    trip to the server. Mailboxes are lists of (sender, message) pairs.
+    """
+
+    def __init__(self):
+        self._manager = multiprocessing.Manager()
+        self._queues = self._manager.dict()
+        self._lock: synchronize.Lock = self._manager.Lock()
+
+    def _ensure_queue(self, key: str):
+        with self._lock:
+            if key not in self._queues:
+                self._queues[key] = self._manager.list()
+
+    def write(
+        self,
+        key: str,
+        message: Any,
+        sender: str | None = None,
+        policy: MailboxPolicy = DEFAULT_MAILBOX_POLICY,
+    ):
+        self._ensure_queue(key)
+        with self._lock:
+            queue = self._queues[key]
+            if policy.mode == MailboxMode.LATEST:
+                queue[:] = [(sender, message)]
+                return
+
+            if policy.mode == MailboxMode.LATEST_PER_SENDER:
+                entries = [entry for entry in queue if entry[0] != sender]
+                entries.append((sender, message))
+                if policy.max_size is not None:
+                    entries = entries[-policy.max_size :]
+                queue[:] = entries
+                return
+
+            queue.append((sender, message))
+            if policy.max_size is not None and len(queue) > policy.max_size:
+                del queue[: -policy.max_size]
+
+    def read(self, key: str) -> Any | None:
+        self._ensure_queue(key)
+        with self._lock:
+            if not self._queues[key]:
+                return None
+            return self._queues[key].pop(0)[1]
+
+    def read_all(self, key: str) -> list[Any]:
+        self._ensure_queue(key)
+        with self._lock:
+            entries = list(self._queues[key])
+            del self._queues[key][:]
+            return [message for _, message in entries]
+
+    def close(self):
+        self._manager.shutdown()
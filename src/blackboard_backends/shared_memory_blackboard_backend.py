@@ -0,0 +1,259 @@
+import multiprocessing
+import pickle
+import struct
+from multiprocessing import shared_memory
+from multiprocessing.context import BaseContext
+from typing import Any
+
+from src.interfaces import BlackboardBackend
+from src.mailbox_policy import DEFAULT_MAILBOX_POLICY, MailboxMode, MailboxPolicy
+
+
+class SharedMemoryBlackboardBackend(BlackboardBackend):
+    """
+    Keeps the queues in a shared memory segment, as one ring buffer of
+    fixed-size slots per key, so that processes exchange messages without a
+    server process in between. Messages are pickled into the slots; when a
+    key has more than capacity unread messages, the oldest ones are dropped.
+    Messages discarded by a coalescing policy are marked as dropped in place
+    and skipped when reading.
+
+    Other processes use the backend by receiving it (or a Blackboard using
+    it) as an argument of multiprocessing.Process, since its lock can only
+    be shared by inheritance. The process that created the backend owns the
+    segment and frees it on close.
+    """
+
+    KEY_SIZE = 64  # bytes, including the length prefix
+
+    _KEY_COUNT = struct.Struct("<Q")
+    _KEY_LENGTH = struct.Struct("<H")
+    _CURSORS = struct.Struct("<QQ")  # head (next read) and tail (next write)
+    # Every slot starts with the payload length and the sender length,
+    # followed by the encoded sender and the pickled message
+    _SLOT_HEADER = struct.Struct("<IH")
+    _DROPPED_LENGTH = struct.Struct("<I")
+    _DROPPED = 0xFFFFFFFF
+    _NO_SENDER = 0xFFFF
+
+    def __init__(
+        self,
+        max_keys: int = 64,
+        capacity: int = 32,
+        slot_size: int = 256,
+        context: BaseContext | None = None,
+    ):
+        self.max_keys = max_keys
+        self.capacity = capacity
+        self.slot_size = slot_size
+        self._memory = shared_memory.SharedMemory(create=True, size=self._size())
+        # The lock must come from the context the processes are started with
+        self._lock = (context or multiprocessing).Lock()
+        self._owner = True
+        self._channels: dict[str, int] = {}
+
+    def __getstate__(self) -> dict:
+        return {
+            "max_keys": self.max_keys,
+            "capacity": self.capacity,
+            "slot_size": self.slot_size,
+            "name": self._memory.name,
+            "lock": self._lock,
+        }
+
+    def __setstate__(self, state: dict):
+        self.max_keys = state["max_keys"]
+        self.capacity = state["capacity"]
+        self.slot_size = state["slot_size"]
+        self._memory = shared_memory.SharedMemory(name=state["name"])
+        self._lock = state["lock"]
+        self._owner = False
+        self._channels = {}
+
+    # The segment holds the key count, the table of keys, the cursors of
+    # every channel and then the slots of every channel
+    def _keys_offset(self) -> int:
+        return self._KEY_COUNT.size
+
+    def _cursors_offset(self, channel: int) -> int:
+        return (
+            self._keys_offset()
+            + self.max_keys * self.KEY_SIZE
+            + channel * self._CURSORS.size
+        )
+
+    def _slot_offset(self, channel: int, position: int) -> int:
+        slots_offset = self._cursors_offset(self.max_keys)
+        return (
+            slots_offset
+            + (channel * self.capacity + position % self.capacity) * self.slot_size
+        )
+
+    def _size(self) -> int:
+        return self._slot_offset(self.max_keys, 0)
+
+    def _channel(self, key: str, create: bool) -> int | None:
+        """
+        Returns the channel of the key, claiming a free one if create is
+        set. Must be called with the lock held.
+        """
+        channel = self._channels.get(key)
+        if channel is not None:
+            return channel
+
+        buffer = self._memory.buf
+        encoded = key.encode()
+        (num_keys,) = self._KEY_COUNT.unpack_from(buffer, 0)
+        for channel in range(num_keys):
+            offset = self._keys_offset() + channel * self.KEY_SIZE
+            (length,) = self._KEY_LENGTH.unpack_from(buffer, offset)
+            start = offset + self._KEY_LENGTH.size
+            if buffer[start : start + length] == encoded:
+                self._channels[key] = channel
+                return channel
+
+        if not create:
+            return None
+        if len(encoded) > self.KEY_SIZE - self._KEY_LENGTH.size:
+            raise ValueError(f"Key too long for the blackboard: {key}")
+        if num_keys == self.max_keys:
+            raise ValueError("No free key left on the blackboard.")
+
+        channel = num_keys
+        offset = self._keys_offset() + channel * self.KEY_SIZE
+        self._KEY_LENGTH.pack_into(buffer, offset, len(encoded))
+        start = offset + self._KEY_LENGTH.size
+        buffer[start : start + len(encoded)] = encoded
+        self._KEY_COUNT.pack_into(buffer, 0, num_keys + 1)
+        self._channels[key] = channel
+        return channel
+
+    def _slot_header(self, channel: int, position: int) -> tuple[int, bytes | None]:
+        """
+        Returns the payload length of a slot, _DROPPED for the messages that
+        were discarded by a policy, and the encoded sender of the message.
+        """
+        buffer = self._memory.buf
+        offset = self._slot_offset(channel, position)
+        length, sender_length = self._SLOT_HEADER.unpack_from(buffer, offset)
+        if sender_length == self._NO_SENDER:
+            return length, None
+        start = offset + self._SLOT_HEADER.size
+        return length, bytes(buffer[start : start + sender_length])
+
+    def _payload(self, channel: int, position: int) -> bytes:
+        buffer = self._memory.buf
+        offset = self._slot_offset(channel, position)
+        length, sender_length = self._SLOT_HEADER.unpack_from(buffer, offset)
+        start = offset + self._SLOT_HEADER.size
+        if sender_length != self._NO_SENDER:
+            start += sender_length
+        return bytes(buffer[start : start + length])
+
+    def _is_dropped(self, channel: int, position: int) -> bool:
+        (length,) = self._DROPPED_LENGTH.unpack_from(
+            self._memory.buf, self._slot_offset(channel, position)
+        )
+        return length == self._DROPPED
+
+    def _drop(self, channel: int, position: int):
+        self._DROPPED_LENGTH.pack_into(
+            self._memory.buf, self._slot_offset(channel, position), self._DROPPED
+        )
+
+    def _trimmed_head(self, channel: int, head: int, tail: int, max_size: int) -> int:
+        """
+        Returns the head that keeps only the max_size newest messages.
+        """
+        kept = 0
+        for position in range(tail - 1, head - 1, -1):
+            kept += not self._is_dropped(channel, position)
+            if kept == max_size:
+                return position
+        return head
+
+    def write(
+        self,
+        key: str,
+        message: Any,
+        sender: str | None = None,
+        policy: MailboxPolicy = DEFAULT_MAILBOX_POLICY,
+    ):
+        payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        encoded_sender = None if sender is None else sender.encode()
+        sender_length = 0 if encoded_sender is None else len(encoded_sender)
+        if self._SLOT_HEADER.size + sender_length + len(payload) > self.slot_size:
+            raise ValueError(
+                f"Message of {len(payload)} bytes does not fit in a blackboard slot."
+            )
+
+        buffer = self._memory.buf
+        with self._lock:
+            channel = self._channel(key, create=True)
+            cursors_offset = self._cursors_offset(channel)
+            head, tail = self._CURSORS.unpack_from(buffer, cursors_offset)
+
+            if policy.mode == MailboxMode.LATEST:
+                head = tail
+            elif policy.mode == MailboxMode.LATEST_PER_SENDER:
+                for position in range(head, tail):
+                    length, other_sender = self._slot_header(channel, position)
+                    if length != self._DROPPED and other_sender == encoded_sender:
+                        self._drop(channel, position)
+
+            offset = self._slot_offset(channel, tail)
+            self._SLOT_HEADER.pack_into(
+                buffer,
+                offset,
+                len(payload),
+                self._NO_SENDER if encoded_sender is None else sender_length,
+            )
+            start = offset + self._SLOT_HEADER.size
+            if encoded_sender is not None:
+                buffer[start : start + sender_length] = encoded_sender
+                start += sender_length
+            buffer[start : start + len(payload)] = payload
+
+            tail += 1
+            head = max(head, tail - self.capacity)
+            if policy.max_size is not None:
+                head = self._trimmed_head(channel, head, tail, policy.max_size)
+            self._CURSORS.pack_into(buffer, cursors_offset, head, tail)
+
+    def read(self, key: str) -> Any | None:
+        buffer = self._memory.buf
+        with self._lock:
+            channel = self._channel(key, create=False)
+            if channel is None:
+                return None
+            cursors_offset = self._cursors_offset(channel)
+            head, tail = self._CURSORS.unpack_from(buffer, cursors_offset)
+            while head < tail and self._is_dropped(channel, head):
+                head += 1
+            if head == tail:
+                self._CURSORS.pack_into(buffer, cursors_offset, head, tail)
+                return None
+            payload = self._payload(channel, head)
+            self._CURSORS.pack_into(buffer, cursors_offset, head + 1, tail)
+        return pickle.loads(payload)
+
+    def read_all(self, key: str) -> list[Any]:
+        buffer = self._memory.buf
+        with self._lock:
+            channel = self._channel(key, create=False)
+            if channel is None:
+                return []
+            cursors_offset = self._cursors_offset(channel)
+            head, tail = self._CURSORS.unpack_from(buffer, cursors_offset)
+            payloads = [
+                self._payload(channel, position)
+                for position in range(head, tail)
+                if not self._is_dropped(channel, position)
+            ]
+            self._CURSORS.pack_into(buffer, cursors_offset, tail, tail)
+        return [pickle.loads(payload) for payload in payloads]
+
+    def close(self):
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
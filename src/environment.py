@@ -1,7 +1,10 @@
+from pydantic import PrivateAttr
+
 from .actions import PlayerAction
 from .agents.moderator import ModeratorAgent, ModeratorPercept
-from .agents.player import PlayerAgent, PlayerPercept
+from .agents.player import PlayerAgent, PlayerObservationPercept, PlayerPercept
 from .interfaces import Environment, Agent, Action, Percept
+from .map import PlayerID
 from .state import GameState
 from .utils import ActionExecutorFactory
 
@@ -9,14 +12,39 @@ from .utils import ActionExecutorFactory
 class GameEnvironment(Environment):
     state: GameState
 
+    # In observation mode, the percepts are created once and keep viewing
+    # the observations of the state
+    _observation_percepts: dict[PlayerID, PlayerObservationPercept] = PrivateAttr(
+        default_factory=dict
+    )
+
     def get_percept(self, agent: Agent) -> Percept:
+        if self.state.observation_mode and not getattr(
+            agent, "supports_observation_mode", True
+        ):
+            raise ValueError(
+                f"{type(agent).__name__} reads Ray models, which observation "
+                "mode doesn't build."
+            )
         if isinstance(agent, PlayerAgent):
+            if self.state.observation_mode:
+                return self._observation_percept(agent.player_id)
             stats = self.state.agent_stats[agent.player_id]
             return PlayerPercept(rays=stats.rays)
         elif isinstance(agent, ModeratorAgent):
             return ModeratorPercept(agent_stats=self.state.agent_stats)
         raise ValueError("Unsupported agent type")
 
+    def _observation_percept(self, player_id: PlayerID) -> PlayerObservationPercept:
+        percept = self._observation_percepts.get(player_id)
+        observations = self.state.observations
+        if percept is None or percept.observation.base is not observations:
+            percept = PlayerObservationPercept(
+                observation=self.state.observation(player_id)
+            )
+            self._observation_percepts[player_id] = percept
+        return percept
+
     def update_state(self, agent: Agent, action: Action) -> None:
         if isinstance(action, PlayerAction):
             executor = ActionExecutorFactory.get_executor(action)
@@ -1,4 +1,14 @@
 from .closest_vec_multiple_angle import closest_vec_multiple_angle
+from .fast_vector2d import FastVector2D
+from .grid_traversal import first_wall_distances
+from .intersections import circles_hit_walls, ray_circle_distances
 from .vector2d import Vector2D
 
-__all__ = ["closest_vec_multiple_angle", "Vector2D"]
+__all__ = [
+    "circles_hit_walls",
+    "closest_vec_multiple_angle",
+    "FastVector2D",
+    "first_wall_distances",
+    "ray_circle_distances",
+    "Vector2D",
+]
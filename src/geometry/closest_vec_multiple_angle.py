@@ -1,9 +1,12 @@
 import math
 
+from .fast_vector2d import FastVector2D
 from .vector2d import Vector2D
 
 
-def closest_vec_multiple_angle(unit_vec: Vector2D, target_angle: float) -> Vector2D:
+def closest_vec_multiple_angle(
+    unit_vec: Vector2D | FastVector2D, target_angle: float
+) -> Vector2D:
     angle_rad = math.atan2(unit_vec.y, unit_vec.x)
     angle_deg = math.degrees(angle_rad)
     rounded_deg = round(angle_deg / target_angle) * target_angle
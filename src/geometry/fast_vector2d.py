@@ -0,0 +1,71 @@
+import math
+
+from .vector2d import Vector2D
+
+
+class FastVector2D:
+    """
+    Slotted counterpart of Vector2D for the hot paths of the simulation (ray
+    marching, movement and collisions). It skips pydantic validation and
+    stores no per-instance dict, so arithmetic is a plain object allocation.
+    Convert with from_model / to_model where a Vector2D model is required.
+    """
+
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float, y: float):
+        self.x = x
+        self.y = y
+
+    @classmethod
+    def from_model(cls, vector: Vector2D) -> "FastVector2D":
+        return cls(vector.x, vector.y)
+
+    def to_model(self) -> Vector2D:
+        return Vector2D.model_construct(x=self.x, y=self.y)
+
+    def __add__(self, other: "FastVector2D") -> "FastVector2D":
+        return FastVector2D(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other: "FastVector2D") -> "FastVector2D":
+        return FastVector2D(self.x - other.x, self.y - other.y)
+
+    def __mul__(self, scalar: float) -> "FastVector2D":
+        return FastVector2D(self.x * scalar, self.y * scalar)
+
+    def __truediv__(self, scalar: float) -> "FastVector2D":
+        return FastVector2D(self.x / scalar, self.y / scalar)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (FastVector2D, Vector2D)):
+            return NotImplemented
+        return self.x == other.x and self.y == other.y
+
+    def __repr__(self) -> str:
+        return f"FastVector2D(x={self.x}, y={self.y})"
+
+    def length(self) -> float:
+        return (self.x**2 + self.y**2) ** 0.5
+
+    def versor(self) -> "FastVector2D":
+        length = self.length()
+        if length == 0:
+            return FastVector2D(0, 0)
+        return self / length
+
+    @classmethod
+    def from_angle(cls, angle_degrees: float) -> "FastVector2D":
+        radians = math.radians(angle_degrees)
+        return cls(math.cos(radians), math.sin(radians))
+
+    def base_angle(self) -> float:
+        return math.degrees(math.atan2(self.y, self.x))
+
+    def rotate(self, angle_deg: float) -> "FastVector2D":
+        radians = math.radians(angle_deg)
+        cos_a = math.cos(radians)
+        sin_a = math.sin(radians)
+        return FastVector2D(
+            self.x * cos_a + self.y * sin_a,
+            -self.x * sin_a + self.y * cos_a,
+        )
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+def first_wall_distances(
+    wall_mask: np.ndarray,
+    origins: np.ndarray,
+    directions: np.ndarray,
+    max_distance: float,
+) -> np.ndarray:
+    """
+    Walks the grid cells crossed by every ray with a digital differential
+    analyzer and returns the distance at which each ray enters its first
+    wall cell, or infinity when no wall is closer than max_distance. Wall
+    cells are unit squares centered on integer coordinates, directions are
+    unit vectors and origins broadcast against them.
+
+    Like CollisionDetector.check_collision_point_wall, walls are open
+    squares: a ray passing exactly through a cell corner only touches the
+    two cells beside the corner and goes on into the diagonal one.
+    """
+    height, width = wall_mask.shape
+    shape = directions.shape[:-1]
+
+    # Shift the origins so that cell (x, y) spans [x, x + 1) x [y, y + 1)
+    start_x = np.broadcast_to(origins[..., 0] + 0.5, shape)
+    start_y = np.broadcast_to(origins[..., 1] + 0.5, shape)
+    dir_x, dir_y = directions[..., 0], directions[..., 1]
+
+    cell_x = np.floor(start_x).astype(np.intp)
+    cell_y = np.floor(start_y).astype(np.intp)
+    step_x = np.sign(dir_x).astype(np.intp)
+    step_y = np.sign(dir_y).astype(np.intp)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta_x = np.abs(1 / dir_x)
+        delta_y = np.abs(1 / dir_y)
+        next_x = np.where(
+            dir_x > 0, (cell_x + 1 - start_x) / dir_x, (cell_x - start_x) / dir_x
+        )
+        next_y = np.where(
+            dir_y > 0, (cell_y + 1 - start_y) / dir_y, (cell_y - start_y) / dir_y
+        )
+    next_x[dir_x == 0] = np.inf
+    next_y[dir_y == 0] = np.inf
+
+    def in_grid():
+        return (cell_x >= 0) & (cell_x < width) & (cell_y >= 0) & (cell_y < height)
+
+    def wall_at(mask):
+        return mask & wall_mask[np.where(mask, cell_y, 0), np.where(mask, cell_x, 0)]
+
+    hit_t = np.full(shape, np.inf)
+    active = in_grid()
+    hit = wall_at(active)
+    hit_t[hit] = 0
+    active &= ~hit
+
+    # Each iteration crosses one cell boundary on every active ray, or both
+    # at once on a corner
+    while active.any():
+        t = np.minimum(next_x, next_y)
+        active &= t <= max_distance
+
+        move_x = active & (next_x == t)
+        move_y = active & (next_y == t)
+        cell_x += np.where(move_x, step_x, 0)
+        cell_y += np.where(move_y, step_y, 0)
+        next_x = np.where(move_x, next_x + delta_x, next_x)
+        next_y = np.where(move_y, next_y + delta_y, next_y)
+
+        active &= in_grid()
+        hit = wall_at(active)
+        hit_t[hit] = t[hit]
+        active &= ~hit
+
+    return hit_t
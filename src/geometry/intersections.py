@@ -0,0 +1,58 @@
+import numpy as np
+
+
+def ray_circle_distances(
+    origins: np.ndarray, directions: np.ndarray, centers: np.ndarray, radius: float
+) -> np.ndarray:
+    """
+    Returns the distance along every ray at which it enters the circle of
+    the given radius around the matching center: 0 when the origin already
+    lies inside it, infinity when the ray misses it or only grazes it.
+    Directions are unit vectors and all arrays broadcast against each other.
+    """
+    # Solves |t * d - c|^2 = r^2 for the center c taken relative to the ray
+    # origin, i.e. t^2 - 2 (d.c) t + |c|^2 - r^2 = 0
+    center = centers - origins
+    projection = (directions * center).sum(axis=-1)
+    offset = (center**2).sum(axis=-1) - radius**2
+    discriminant = projection**2 - offset
+
+    with np.errstate(invalid="ignore"):
+        t = projection - np.sqrt(discriminant)
+    t = np.where(offset < 0, 0, t)
+    return np.where((discriminant > 0) & (t >= 0), t, np.inf)
+
+
+def circles_hit_walls(
+    wall_mask: np.ndarray, centers: np.ndarray, radius: float
+) -> np.ndarray:
+    """
+    Tests every circle of the given radius (at most half a cell) around the
+    (..., 2) centers against the unit wall squares of the eight cells around
+    it and its own, like GameMap.circle_hits_wall. Cells outside the mask
+    are not walls.
+    """
+    height, width = wall_mask.shape
+    hits = np.zeros(centers.shape[:-1], dtype=bool)
+    cell_x = np.trunc(centers[..., 0]).astype(np.intp)
+    cell_y = np.trunc(centers[..., 1]).astype(np.intp)
+    for offset_y in (-1, 0, 1):
+        for offset_x in (-1, 0, 1):
+            other_x = cell_x + offset_x
+            other_y = cell_y + offset_y
+            inside = (other_x >= 0) & (other_x < width)
+            inside &= (other_y >= 0) & (other_y < height)
+            is_wall = (
+                inside
+                & wall_mask[np.where(inside, other_y, 0), np.where(inside, other_x, 0)]
+            )
+
+            # Distance from the center to the closest point of the square
+            dx = centers[..., 0] - np.clip(
+                centers[..., 0], other_x - 0.5, other_x + 0.5
+            )
+            dy = centers[..., 1] - np.clip(
+                centers[..., 1], other_y - 0.5, other_y + 0.5
+            )
+            hits |= is_wall & ((dx**2 + dy**2) ** 0.5 < radius)
+    return hits
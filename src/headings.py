@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+
+from .constants import PLAYER_NUM_RAYS, PLAYER_ROTATE_DEGREES, PLAYER_VIEW_FOV
+from .geometry import FastVector2D, Vector2D
+
+# Agents only ever face multiples of PLAYER_ROTATE_DEGREES, so their heading
+# is stored as the index of that multiple and every direction derived from
+# it is looked up in the tables below, built once with the same formulas the
+# simulation used to evaluate every tick.
+NUM_HEADINGS = round(360 / PLAYER_ROTATE_DEGREES)
+
+
+def _heading_degrees(heading: int) -> float:
+    # In (-180, 180], like the angles given by atan2
+    degrees = heading * PLAYER_ROTATE_DEGREES
+    return degrees - 360 if degrees > 180 else degrees
+
+
+def _build_tables():
+    directions = []
+    angles = []
+    ray_directions = []
+    relative_ray_directions = []
+    angle_step = PLAYER_VIEW_FOV / (PLAYER_NUM_RAYS - 1)
+    for heading in range(NUM_HEADINGS):
+        direction = FastVector2D.from_angle(_heading_degrees(heading))
+        base_angle = direction.base_angle()
+        rays = [
+            FastVector2D.from_angle(base_angle - PLAYER_VIEW_FOV / 2 + i * angle_step)
+            for i in range(PLAYER_NUM_RAYS)
+        ]
+        directions.append((direction.x, direction.y))
+        angles.append(base_angle)
+        ray_directions.append([(ray.x, ray.y) for ray in rays])
+        relative_ray_directions.append(
+            [
+                (relative.x, relative.y)
+                for relative in (
+                    FastVector2D.from_angle(ray.base_angle() - base_angle)
+                    for ray in rays
+                )
+            ]
+        )
+    return (
+        np.array(directions),
+        np.array(angles),
+        np.array(ray_directions),
+        np.array(relative_ray_directions),
+    )
+
+
+# (NUM_HEADINGS, 2) unit directions and (NUM_HEADINGS,) angles in degrees
+# (NUM_HEADINGS, PLAYER_NUM_RAYS, 2) directions of the field of view rays,
+# absolute and relative to the heading
+HEADING_DIRECTIONS, HEADING_ANGLES, RAY_DIRECTIONS, RELATIVE_RAY_DIRECTIONS = (
+    _build_tables()
+)
+HEADING_DIRECTIONS.flags.writeable = False
+HEADING_ANGLES.flags.writeable = False
+RAY_DIRECTIONS.flags.writeable = False
+RELATIVE_RAY_DIRECTIONS.flags.writeable = False
+
+# The same tables as vectors, for the code working on single agents. The
+# relative directions are shared by all the rays built from them, they must
+# not be modified in place.
+RAY_VECTORS: list[list[FastVector2D]] = [
+    [FastVector2D(x, y) for x, y in rays] for rays in RAY_DIRECTIONS.tolist()
+]
+RELATIVE_RAY_VECTORS: list[list[Vector2D]] = [
+    [Vector2D.model_construct(x=x, y=y) for x, y in rays]
+    for rays in RELATIVE_RAY_DIRECTIONS.tolist()
+]
+
+
+def heading_index(direction: Vector2D | FastVector2D) -> int:
+    """
+    Returns the heading closest to the direction.
+    """
+    degrees = math.degrees(math.atan2(direction.y, direction.x))
+    return round(degrees / PLAYER_ROTATE_DEGREES) % NUM_HEADINGS
+
+
+def heading_vector(heading: int) -> Vector2D:
+    x, y = HEADING_DIRECTIONS[heading].tolist()
+    return Vector2D.model_construct(x=x, y=y)
@@ -1,17 +1,23 @@
 from .action import Action
 from .agent import Agent
+from .blackboard_backend import BlackboardBackend
 from .environment import Environment
 from .executable_action import ExecutableAction
 from .percept import Percept
+from .ray_caster import RayCaster
 from .render_engine import RenderEngine
+from .simulation_observer import SimulationObserver
 from .state import State
 
 __all__ = [
     "Action",
     "Agent",
+    "BlackboardBackend",
     "Environment",
     "ExecutableAction",
     "Percept",
+    "RayCaster",
     "RenderEngine",
+    "SimulationObserver",
     "State",
 ]
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from src.mailbox_policy import DEFAULT_MAILBOX_POLICY, MailboxPolicy
+
+
+class BlackboardBackend(ABC):
+    """
+    Storage of the Blackboard messages: a mailbox of messages per key, which
+    keeps them according to the MailboxPolicy given on write.
+    """
+
+    @abstractmethod
+    def write(
+        self,
+        key: str,
+        message: Any,
+        sender: str | None = None,
+        policy: MailboxPolicy = DEFAULT_MAILBOX_POLICY,
+    ):
+        """
+        Adds the message of the sender to the mailbox of the key.
+        """
+        pass
+
+    @abstractmethod
+    def read(self, key: str) -> Any | None:
+        """
+        Pops the oldest message of the key, or returns None if there is none.
+        """
+        pass
+
+    @abstractmethod
+    def read_all(self, key: str) -> list[Any]:
+        """
+        Pops all the messages of the key, oldest first.
+        """
+        pass
+
+    def close(self):
+        """
+        Releases the resources held by the backend.
+        """
+        pass
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.observations import write_ray_observations
+
+from .state import State
+
+
+class RayCaster(ABC):
+    """
+    Computes the sensor rays of the agents in a state. Implementations are
+    free to trade generality for speed, but must return one list of rays,
+    in the same format, for every agent in the state.
+    """
+
+    @abstractmethod
+    def compute_rays(
+        self, state: State, agents: np.ndarray | None = None
+    ) -> dict[str, list]:
+        """
+        Casts the full fan of rays for every agent in the state and returns
+        them keyed by the agent's id. When given, only the agents at these
+        indices of the state's agent order cast their rays, in that order.
+        """
+        pass
+
+    def options(self) -> dict | None:
+        """
+        The keyword arguments rebuilding an equivalent caster, for the
+        casters that can be saved along with a match, like in replays. None
+        when the caster can't be rebuilt.
+        """
+        return None
+
+    def compute_observations(
+        self, state: State, out: np.ndarray, agents: np.ndarray | None = None
+    ) -> None:
+        """
+        Casts the rays of every agent in the state, or of the given agents,
+        into their rows of the (agents, rays, OBSERVATION_FEATURES)
+        observations. By default the rays of compute_rays are converted;
+        casters working on arrays should write them directly.
+        """
+        rows = range(len(out)) if agents is None else agents
+        for row, rays in zip(rows, self.compute_rays(state, agents).values()):
+            write_ray_observations(out[row], rays)
@@ -0,0 +1,31 @@
+from abc import ABC
+
+from .action import Action
+from .agent import Agent
+from .state import State
+
+
+class SimulationObserver(ABC):
+    """
+    Hooks called by a simulation as it runs, for anything that watches it
+    without taking part in it (recorders, loggers, external viewers).
+    """
+
+    def on_start(self, state: State):
+        """
+        Called with the initial state, before the first step.
+        """
+        pass
+
+    def on_step(self, state: State, actions: list[tuple[Agent, Action]]):
+        """
+        Called after every step with the new state and the actions that led
+        to it, in the order they were applied.
+        """
+        pass
+
+    def on_stop(self, state: State):
+        """
+        Called with the final state once the simulation is over.
+        """
+        pass
@@ -0,0 +1,38 @@
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class MailboxMode(str, Enum):
+    FIFO = "fifo"  # every message, oldest first
+    LATEST = "latest"  # only the last message written
+    LATEST_PER_SENDER = "latest_per_sender"  # the last message of every sender
+
+
+class MailboxPolicy(BaseModel):
+    """
+    How the mailbox of a Blackboard key keeps the messages written to it.
+    Policies are applied on write, so reading stays a pop of the oldest kept
+    message whatever the policy.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    mode: MailboxMode = MailboxMode.FIFO
+    # The oldest messages are dropped beyond it
+    max_size: int | None = Field(default=None, ge=1)
+
+    @classmethod
+    def bounded_fifo(cls, max_size: int) -> "MailboxPolicy":
+        return cls(mode=MailboxMode.FIFO, max_size=max_size)
+
+    @classmethod
+    def latest(cls) -> "MailboxPolicy":
+        return cls(mode=MailboxMode.LATEST, max_size=1)
+
+    @classmethod
+    def coalesce_by_sender(cls, max_size: int | None = None) -> "MailboxPolicy":
+        return cls(mode=MailboxMode.LATEST_PER_SENDER, max_size=max_size)
+
+
+DEFAULT_MAILBOX_POLICY = MailboxPolicy()
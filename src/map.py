@@ -1,14 +1,39 @@
+import json
+import math
+import os
+import struct
 import uuid
 
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
 
-from src.geometry import Vector2D, closest_vec_multiple_angle
+from src.geometry import Vector2D
 
-from .constants import PLAYER_ROTATE_DEGREES
+from .headings import heading_index, heading_vector
+from .objects import WALL_SIZE
+from .wall_visibility import WallVisibilityCache
 
 
 PlayerID = str
 
+FREE_CELL = 0
+WALL_CELL = 1
+
+COMPILED_MAP_MAGIC = b"MARLGMAP"
+COMPILED_MAP_VERSION = 1
+COMPILED_MAP_SUFFIX = ".gmap"
+
+# A compiled map is the magic, the version, a JSON header with the size and
+# the spawn points, then the grid and the distance field, each starting at a
+# multiple of _ALIGNMENT bytes
+_COMPILED_PREFIX = struct.Struct("<8sH")
+_COMPILED_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
 
 class PlayerMapData(BaseModel):
     player_id: PlayerID
@@ -16,29 +41,58 @@ class PlayerMapData(BaseModel):
     position: Vector2D
     direction: Vector2D | None = None
 
+    # The direction the heading was last computed for, and the heading
+    _heading: tuple[float, float, int] | None = PrivateAttr(default=None)
+
+    @property
+    def heading(self) -> int | None:
+        """
+        Index of the direction in the heading tables of src.headings, None
+        without a direction. It is kept along with the direction it was
+        computed for, so assigning the direction directly is still safe.
+        """
+        direction = self.direction
+        if direction is None:
+            return None
+        cached = self._heading
+        if cached is None or cached[0] != direction.x or cached[1] != direction.y:
+            cached = (direction.x, direction.y, heading_index(direction))
+            self._heading = cached
+        return cached[2]
+
+    def set_heading(self, heading: int):
+        self.direction = heading_vector(heading)
+        self._heading = (self.direction.x, self.direction.y, heading)
+
     def _compute_default_direction(self, target: Vector2D):
-        dir_vec = (target - self.position).versor()
-        dir_vec = closest_vec_multiple_angle(dir_vec, PLAYER_ROTATE_DEGREES)
-        self.direction = dir_vec
+        self.set_heading(heading_index((target - self.position).versor()))
 
 
 class GameMap(BaseModel):
-    grid: list[list[str]]
     width: int
     height: int
-    walls: list[Vector2D]
     players: dict[PlayerID, PlayerMapData]
 
+    # (height, width) uint8 grid of FREE_CELL and WALL_CELL codes, and the
+    # indices precomputed from it, see _build_wall_index. Compiled maps
+    # memory map the grid and the distance field instead of computing them.
+    _cells: np.ndarray = PrivateAttr()
+    _wall_mask: np.ndarray = PrivateAttr()
+    _wall_bytes: bytes | None = PrivateAttr(default=None)
+    _wall_distance: np.ndarray = PrivateAttr()
+    _walls: list[Vector2D] | None = PrivateAttr(default=None)
+
+    # The file the map was loaded from, the version of the map file a
+    # compiled map was compiled from, and the lazily built wall visibility
+    _path: str | None = PrivateAttr(default=None)
+    _source: list[int] | None = PrivateAttr(default=None)
+    _wall_visibility: WallVisibilityCache | None = PrivateAttr(default=None)
+
     def __init__(self, grid: list[list[str]]):
-        grid = self._pad_with_walls(grid)
-        super().__init__(
-            grid=grid,
-            width=len(grid[0]),
-            height=len(grid),
-            walls=set(),
-            players={},
-        )
-        self._process_grid()
+        grid = np.array(self._pad_with_walls(grid))
+        super().__init__(width=grid.shape[1], height=grid.shape[0], players={})
+        self._process_grid(grid)
+        self._build_wall_index()
 
     @classmethod
     def from_file(cls, path: str) -> "GameMap":
@@ -46,7 +100,130 @@ class GameMap(BaseModel):
             lines = [line.rstrip() for line in f if line.strip()]
             max_width = max(len(line) for line in lines)
             grid = [list(line.ljust(max_width, ".")) for line in lines]
-        return cls(grid)
+        game_map = cls(grid)
+        game_map._path = path
+        return game_map
+
+    @classmethod
+    def load(cls, path: str, compile: bool = False) -> "GameMap":
+        """
+        Loads the map file through its compiled version, next to it, when it
+        is up to date with the map file, and parses the map file otherwise.
+        Loading a compiled map skips parsing and indexing the grid, and its
+        arrays are memory mapped, so they are shared by every match started
+        from it. With compile, a missing or outdated compiled version is
+        written, if the directory is writable.
+        """
+        compiled_path = os.path.splitext(path)[0] + COMPILED_MAP_SUFFIX
+        source = os.stat(path)
+        try:
+            game_map = cls.load_compiled(compiled_path)
+            if game_map._source == [source.st_mtime_ns, source.st_size]:
+                game_map._path = path
+                return game_map
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+
+        game_map = cls.from_file(path)
+        if compile:
+            try:
+                game_map.save_compiled(
+                    compiled_path, source=[source.st_mtime_ns, source.st_size]
+                )
+            except OSError:
+                pass
+        return game_map
+
+    def save_compiled(self, path: str, source: list[int] | None = None):
+        """
+        Writes the map in the compiled format: the magic, the version, a JSON
+        header with the size and the spawn points, then the uint8 grid and
+        the distance field, aligned so they can be memory mapped. source
+        identifies the version of the map file it was compiled from.
+        """
+        header = json.dumps(
+            {
+                "width": self.width,
+                "height": self.height,
+                "source": source,
+                "players": [
+                    [
+                        player.team,
+                        player.position.x,
+                        player.position.y,
+                        player.heading,
+                    ]
+                    for player in self.players.values()
+                ],
+            }
+        ).encode()
+        cells_offset, distance_offset = self._compiled_offsets(
+            len(header), self.width * self.height
+        )
+        # Written to a temporary file first, so that concurrent loads never
+        # map a partially written one
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temporary_path, "wb") as f:
+                f.write(_COMPILED_PREFIX.pack(COMPILED_MAP_MAGIC, COMPILED_MAP_VERSION))
+                f.write(_COMPILED_HEADER_LENGTH.pack(len(header)))
+                f.write(header)
+                f.seek(cells_offset)
+                f.write(np.ascontiguousarray(self._cells).tobytes())
+                f.seek(distance_offset)
+                f.write(
+                    np.ascontiguousarray(self._wall_distance, dtype="<f8").tobytes()
+                )
+            os.replace(temporary_path, path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+    @classmethod
+    def load_compiled(cls, path: str) -> "GameMap":
+        with open(path, "rb") as f:
+            prefix = f.read(_COMPILED_PREFIX.size + _COMPILED_HEADER_LENGTH.size)
+            if len(prefix) < _COMPILED_PREFIX.size + _COMPILED_HEADER_LENGTH.size:
+                raise ValueError(f"{path} is not a supported compiled map.")
+            magic, version = _COMPILED_PREFIX.unpack_from(prefix, 0)
+            if magic != COMPILED_MAP_MAGIC or version != COMPILED_MAP_VERSION:
+                raise ValueError(f"{path} is not a supported compiled map.")
+            (header_length,) = _COMPILED_HEADER_LENGTH.unpack_from(
+                prefix, _COMPILED_PREFIX.size
+            )
+            header = json.loads(f.read(header_length))
+
+        width, height = header["width"], header["height"]
+        cells_offset, distance_offset = cls._compiled_offsets(
+            header_length, width * height
+        )
+        game_map = cls.model_construct(width=width, height=height, players={})
+        game_map._cells = np.memmap(
+            path, dtype=np.uint8, mode="r", offset=cells_offset, shape=(height, width)
+        )
+        game_map._wall_mask = game_map._cells.view(bool)
+        game_map._wall_distance = np.memmap(
+            path, dtype="<f8", mode="r", offset=distance_offset, shape=(height, width)
+        )
+        game_map._source = header["source"]
+        game_map._path = path
+
+        for team, x, y, heading in header["players"]:
+            player = PlayerMapData.model_construct(
+                player_id=str(uuid.uuid4()),
+                team=team,
+                position=Vector2D.model_construct(x=x, y=y),
+            )
+            player.set_heading(heading)
+            game_map.players[player.player_id] = player
+        return game_map
+
+    @staticmethod
+    def _compiled_offsets(header_length: int, num_cells: int) -> tuple[int, int]:
+        cells_offset = _align(
+            _COMPILED_PREFIX.size + _COMPILED_HEADER_LENGTH.size + header_length
+        )
+        return cells_offset, _align(cells_offset + num_cells)
 
     @classmethod
     def _pad_with_walls(cls, grid: list[list[str]]) -> list[list[str]]:
@@ -62,27 +239,181 @@ class GameMap(BaseModel):
 
         return padded
 
-    def _process_grid(self):
+    def _process_grid(self, grid: np.ndarray):
         center = Vector2D(x=self.width, y=self.height) / 2
-        for y, row in enumerate(self.grid):
-            for x, cell in enumerate(row):
-                if cell == ".":
-                    continue
-                elif cell == "#":
-                    self.walls.append(Vector2D(x=x, y=y))
-                else:
-                    player_id = str(uuid.uuid4())
-                    team = cell
-                    player = PlayerMapData(
-                        position=Vector2D(x=x, y=y), team=team, player_id=player_id
-                    )
-                    player._compute_default_direction(center)
-                    self.players[player_id] = player
-                    self.grid[y][x] = "."
+        self._cells = np.where(grid == "#", WALL_CELL, FREE_CELL).astype(np.uint8)
+        for y, x in zip(*np.nonzero((grid != ".") & (grid != "#"))):
+            player_id = str(uuid.uuid4())
+            player = PlayerMapData(
+                position=Vector2D(x=int(x), y=int(y)),
+                team=str(grid[y, x]),
+                player_id=player_id,
+            )
+            player._compute_default_direction(center)
+            self.players[player_id] = player
+
+    def _build_wall_index(self):
+        self._wall_mask = self._cells.view(bool)
+        self._wall_bytes = self._cells.tobytes()
+        self._wall_distance = self._compute_wall_distance(self._wall_mask)
+
+    @property
+    def grid(self) -> list[list[str]]:
+        """
+        The map as rows of "#" for the walls and "." for the free cells,
+        including the wall padding and without the players.
+        """
+        return [["#" if wall else "." for wall in row] for row in self._cells.tolist()]
+
+    @property
+    def walls(self) -> list[Vector2D]:
+        """
+        The centers of the wall cells, row by row.
+        """
+        if self._walls is None:
+            ys, xs = np.nonzero(self._wall_mask)
+            self._walls = [Vector2D(x=x, y=y) for x, y in zip(xs.tolist(), ys.tolist())]
+        return self._walls
+
+    @staticmethod
+    def _compute_wall_distance(wall_mask: np.ndarray) -> np.ndarray:
+        """
+        Exact Euclidean distance from every cell center to the center of the
+        closest wall cell, computed separably: first along the columns, then
+        along the rows.
+        """
+        height, width = wall_mask.shape
+        column_distance = np.full((height, width), np.inf)
+        last_wall = np.full(width, -np.inf)
+        for y in range(height):
+            last_wall[wall_mask[y]] = y
+            column_distance[y] = y - last_wall
+        last_wall[:] = np.inf
+        for y in reversed(range(height)):
+            last_wall[wall_mask[y]] = y
+            np.minimum(column_distance[y], last_wall - y, out=column_distance[y])
+
+        columns = np.arange(width)
+        offsets = (columns[:, None] - columns[None, :]) ** 2
+        squared = column_distance**2
+        distance = np.empty((height, width))
+        for y in range(height):
+            distance[y] = np.sqrt((offsets + squared[y][None, :]).min(axis=1))
+        return distance
+
+    @property
+    def wall_mask(self) -> np.ndarray:
+        """
+        Read-only (height, width) boolean occupancy grid of the walls.
+        """
+        mask = self._wall_mask.view()
+        mask.flags.writeable = False
+        return mask
+
+    @property
+    def wall_visibility_path(self) -> str | None:
+        """
+        Where the wall visibility cache is persisted, next to the map file.
+        """
+        if self._path is None:
+            return None
+        return os.path.splitext(self._path)[0] + ".walls.npz"
+
+    @property
+    def wall_visibility(self) -> WallVisibilityCache:
+        """
+        The wall visibility cache of the map, built on first access and
+        starting from the entries saved next to the map file, if any.
+        """
+        if self._wall_visibility is None:
+            path = self.wall_visibility_path
+            if path is None:
+                self._wall_visibility = WallVisibilityCache(self._wall_mask)
+            else:
+                self._wall_visibility = WallVisibilityCache.load(path, self._wall_mask)
+        return self._wall_visibility
+
+    def save_wall_visibility(self):
+        path = self.wall_visibility_path
+        if path is None:
+            raise ValueError("Only maps loaded from a file can save their cache.")
+        self.wall_visibility.save(path)
 
     def _point_inside_grid(self, x: int | float, y: int | float) -> bool:
         return 0 <= x < self.width and 0 <= y < self.height
 
+    def is_wall_cell(self, x: int, y: int) -> bool:
+        if not self._point_inside_grid(x, y):
+            return False
+        wall_bytes = self._wall_bytes
+        if wall_bytes is None:
+            # Compiled maps only copy their memory mapped grid once needed
+            wall_bytes = self._wall_bytes = self._cells.tobytes()
+        return wall_bytes[y * self.width + x] == 1
+
+    @staticmethod
+    def _cell_containing(value: float) -> int | None:
+        """
+        Returns the cell whose open interval (c - WALL_SIZE / 2, c + WALL_SIZE
+        / 2) contains the coordinate, or None if it lies on a cell border.
+        """
+        cell = math.floor(value + WALL_SIZE / 2)
+        if cell - WALL_SIZE / 2 < value < cell + WALL_SIZE / 2:
+            return cell
+        # value + WALL_SIZE / 2 may have been rounded up to the next integer
+        if cell - 3 * WALL_SIZE / 2 < value < cell - WALL_SIZE / 2:
+            return cell - 1
+        return None
+
+    def point_in_wall(self, x: float, y: float) -> bool:
+        """
+        O(1) equivalent of testing the point against its nearest walls with
+        CollisionDetector.check_collision_point_wall.
+        """
+        cell_x = self._cell_containing(x)
+        cell_y = self._cell_containing(y)
+        if cell_x is None or cell_y is None:
+            return False
+        return self.is_wall_cell(cell_x, cell_y)
+
+    def wall_clearance(self, x: float, y: float) -> float:
+        """
+        Distance from the center of the cell containing the point to the
+        center of the closest wall cell.
+        """
+        cell_x, cell_y = round(x), round(y)
+        if not self._point_inside_grid(cell_x, cell_y):
+            return 0.0
+        return float(self._wall_distance[cell_y, cell_x])
+
+    def circle_hits_wall(self, x: float, y: float, radius: float) -> bool:
+        """
+        O(1) equivalent of testing a circle of the given radius (smaller than
+        WALL_SIZE / 2) against its nearest walls with
+        CollisionDetector.check_collision_player_wall.
+        """
+        # The point is at most sqrt(2) / 2 away from its cell center, and a
+        # wall square reaches at most as far from its own center
+        if self.wall_clearance(x, y) - math.sqrt(2) * WALL_SIZE >= radius:
+            return False
+
+        point_x, point_y = int(x), int(y)
+        for other_y in range(point_y - 1, point_y + 2):
+            for other_x in range(point_x - 1, point_x + 2):
+                if not self.is_wall_cell(other_x, other_y):
+                    continue
+                closest_x = max(
+                    other_x - WALL_SIZE / 2, min(x, other_x + WALL_SIZE / 2)
+                )
+                closest_y = max(
+                    other_y - WALL_SIZE / 2, min(y, other_y + WALL_SIZE / 2)
+                )
+                dx = x - closest_x
+                dy = y - closest_y
+                if (dx**2 + dy**2) ** 0.5 < radius:
+                    return True
+        return False
+
     def nearest_walls(self, point: Vector2D) -> list[Vector2D]:
         point_x, point_y = int(point.x), int(point.y)
         walls = []
@@ -90,9 +421,6 @@ class GameMap(BaseModel):
             for dy in [-1, 0, 1]:
                 other_x = point_x + dx
                 other_y = point_y + dy
-                if not self._point_inside_grid(other_x, other_y):
-                    continue
-                other = self.grid[other_y][other_x]
-                if other == "#":
+                if self.is_wall_cell(other_x, other_y):
                     walls.append(Vector2D(x=other_x, y=other_y))
         return walls
@@ -0,0 +1,176 @@
+import string
+from collections import deque
+
+import numpy as np
+
+from .map import GameMap
+
+TEAM_NAMES = string.ascii_uppercase
+
+
+def generate_map(
+    width: int,
+    height: int,
+    num_teams: int = 2,
+    players_per_team: int = 4,
+    num_rooms: int | None = None,
+    room_size: tuple[int, int] = (6, 20),
+    corridor_width: int = 2,
+    obstacle_density: float = 0.05,
+    seed: int | None = None,
+) -> GameMap:
+    """
+    Generates a width x height map (before the wall border GameMap adds) of
+    rectangular rooms, with sides in room_size, linked in sequence by
+    L-shaped corridors. By default there is one room per 400 cells, and
+    with no rooms the whole map is a single open area. A fraction
+    obstacle_density of the free cells is then turned into single wall
+    obstacles, the cells cut off from the largest open area being walled
+    too, so every player can reach every other one.
+
+    Teams are named after the letters of TEAM_NAMES and are spawned in
+    different rooms when possible, on random free cells. The layout and the
+    spawns only depend on the seed.
+    """
+    if not 1 <= num_teams <= len(TEAM_NAMES):
+        raise ValueError(f"num_teams must be between 1 and {len(TEAM_NAMES)}.")
+    rng = np.random.default_rng(seed)
+    if num_rooms is None:
+        num_rooms = max(1, width * height // 400)
+
+    if num_rooms > 0:
+        walls = np.ones((height, width), dtype=bool)
+        rooms = _carve_rooms(walls, num_rooms, room_size, rng)
+        for first, second in zip(rooms, rooms[1:]):
+            _carve_corridor(walls, first, second, corridor_width, rng)
+    else:
+        walls = np.zeros((height, width), dtype=bool)
+        rooms = [(0, 0, width, height)]
+
+    walls |= rng.random(walls.shape) < obstacle_density
+    walls |= ~_largest_open_area(walls)
+
+    grid = np.where(walls, "#", ".")
+    num_players = num_teams * players_per_team
+    if num_players > np.count_nonzero(~walls):
+        raise ValueError("Not enough free cells for the players.")
+    taken = walls.copy()
+    room_order = rng.permutation(len(rooms))
+    for team in range(num_teams):
+        x, y, room_width, room_height = rooms[room_order[team % len(rooms)]]
+        for _ in range(players_per_team):
+            cell_y, cell_x = _free_cell(taken, x, y, room_width, room_height, rng)
+            grid[cell_y, cell_x] = TEAM_NAMES[team]
+            taken[cell_y, cell_x] = True
+    return GameMap(grid.tolist())
+
+
+def _carve_rooms(
+    walls: np.ndarray,
+    num_rooms: int,
+    room_size: tuple[int, int],
+    rng: np.random.Generator,
+    max_attempts: int = 50,
+) -> list[tuple[int, int, int, int]]:
+    """
+    Carves up to num_rooms non-overlapping rooms and returns their (x, y,
+    width, height), sorted from left to right so the corridors stay short.
+    """
+    height, width = walls.shape
+    rooms = []
+    for _ in range(num_rooms * max_attempts):
+        if len(rooms) == num_rooms:
+            break
+        room_width, room_height = rng.integers(
+            room_size[0], room_size[1] + 1, size=2
+        ).tolist()
+        room_width, room_height = min(room_width, width), min(room_height, height)
+        x = int(rng.integers(0, width - room_width + 1))
+        y = int(rng.integers(0, height - room_height + 1))
+        # Rooms keep at least one wall between them
+        if any(
+            x <= other_x + other_width
+            and other_x <= x + room_width
+            and y <= other_y + other_height
+            and other_y <= y + room_height
+            for other_x, other_y, other_width, other_height in rooms
+        ):
+            continue
+        walls[y : y + room_height, x : x + room_width] = False
+        rooms.append((x, y, room_width, room_height))
+    return sorted(rooms)
+
+
+def _carve_corridor(
+    walls: np.ndarray,
+    first: tuple[int, int, int, int],
+    second: tuple[int, int, int, int],
+    corridor_width: int,
+    rng: np.random.Generator,
+):
+    height, width = walls.shape
+    (x0, y0), (x1, y1) = (
+        (
+            int(rng.integers(x, x + room_width)),
+            int(rng.integers(y, y + room_height)),
+        )
+        for x, y, room_width, room_height in (first, second)
+    )
+    top = min(y0, height - corridor_width)
+    left = min(x1, width - corridor_width)
+    walls[top : top + corridor_width, min(x0, x1) : max(x0, x1) + 1] = False
+    walls[min(y0, y1) : max(y0, y1) + 1, left : left + corridor_width] = False
+
+
+def _largest_open_area(walls: np.ndarray) -> np.ndarray:
+    """
+    Returns the mask of the largest 4-connected area of free cells.
+    """
+    height, width = walls.shape
+    labels = np.full(walls.size, -1, dtype=np.int64)
+    free = ~walls.ravel()
+    sizes = []
+    for start in np.flatnonzero(free):
+        if labels[start] >= 0:
+            continue
+        label = len(sizes)
+        labels[start] = label
+        queue = deque([start])
+        size = 0
+        while queue:
+            cell = queue.popleft()
+            size += 1
+            x = cell % width
+            for neighbor, inside in (
+                (cell - 1, x > 0),
+                (cell + 1, x < width - 1),
+                (cell - width, cell >= width),
+                (cell + width, cell < walls.size - width),
+            ):
+                if inside and free[neighbor] and labels[neighbor] < 0:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+        sizes.append(size)
+    if not sizes:
+        return np.zeros_like(walls)
+    return (labels == int(np.argmax(sizes))).reshape(height, width)
+
+
+def _free_cell(
+    taken: np.ndarray,
+    x: int,
+    y: int,
+    width: int,
+    height: int,
+    rng: np.random.Generator,
+) -> tuple[int, int]:
+    """
+    Returns a random free cell of the area, or of the whole map once the
+    area is full.
+    """
+    ys, xs = np.nonzero(~taken[y : y + height, x : x + width])
+    if len(ys) == 0:
+        ys, xs = np.nonzero(~taken)
+        x = y = 0
+    choice = int(rng.integers(len(ys)))
+    return int(ys[choice]) + y, int(xs[choice]) + x
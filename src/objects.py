@@ -2,7 +2,7 @@ from enum import IntEnum
 
 from pydantic import BaseModel
 
-from src.geometry import Vector2D
+from src.geometry import FastVector2D, Vector2D
 
 
 class GameObject(IntEnum):
@@ -15,26 +15,36 @@ class GameObject(IntEnum):
 WALL_SIZE = 1
 PLAYER_DIAMETER = 0.8
 
+# Both the pydantic and the slotted vectors can be used for collision checks
+Point = Vector2D | FastVector2D
+
 
 class CollisionDetector:
     @classmethod
-    def check_collision_point_wall(cls, point: Vector2D, wall: Vector2D) -> bool:
+    def check_collision_point_wall(cls, point: Point, wall: Point) -> bool:
         return (
             wall.x - WALL_SIZE / 2 < point.x < wall.x + WALL_SIZE / 2
             and wall.y - WALL_SIZE / 2 < point.y < wall.y + WALL_SIZE / 2
         )
 
     @classmethod
-    def check_collision_point_player(cls, point: Vector2D, player: Vector2D) -> bool:
-        return (player - point).length() < PLAYER_DIAMETER / 2
+    def distance(cls, first: Point, second: Point) -> float:
+        dx = second.x - first.x
+        dy = second.y - first.y
+        return (dx**2 + dy**2) ** 0.5
+
+    @classmethod
+    def check_collision_point_player(cls, point: Point, player: Point) -> bool:
+        return cls.distance(point, player) < PLAYER_DIAMETER / 2
 
     @classmethod
-    def check_collision_player_wall(cls, player: Vector2D, wall: Vector2D) -> bool:
-        dx = max(wall.x - WALL_SIZE / 2, min(player.x, wall.x + WALL_SIZE / 2))
-        dy = max(wall.y - WALL_SIZE / 2, min(player.y, wall.y + WALL_SIZE / 2))
+    def check_collision_player_wall(cls, player: Point, wall: Point) -> bool:
+        closest_x = max(wall.x - WALL_SIZE / 2, min(player.x, wall.x + WALL_SIZE / 2))
+        closest_y = max(wall.y - WALL_SIZE / 2, min(player.y, wall.y + WALL_SIZE / 2))
 
-        closest_point = Vector2D(x=dx, y=dy)
-        return (player - closest_point).length() < PLAYER_DIAMETER / 2
+        dx = player.x - closest_x
+        dy = player.y - closest_y
+        return (dx**2 + dy**2) ** 0.5 < PLAYER_DIAMETER / 2
 
 
 class Ray(BaseModel):
@@ -0,0 +1,50 @@
+import numpy as np
+
+from .constants import PLAYER_NUM_RAYS, PLAYER_VIEW_FOV
+from .objects import GameObject, Ray
+
+# Features of every ray of an observation: its relative distance, the
+# GameObject it hit as a one-hot vector and its direction relative to the
+# agent's heading
+DISTANCE_FEATURE = 0
+OBJECT_FEATURES = slice(1, 1 + len(GameObject))
+DIRECTION_FEATURES = slice(1 + len(GameObject), 3 + len(GameObject))
+OBSERVATION_FEATURES = 3 + len(GameObject)
+
+
+def allocate_observations(num_agents: int) -> np.ndarray:
+    """
+    Returns a (num_agents, PLAYER_NUM_RAYS, OBSERVATION_FEATURES) float32
+    array, with the relative ray directions, which never change, filled in.
+    """
+    observations = np.zeros(
+        (num_agents, PLAYER_NUM_RAYS, OBSERVATION_FEATURES), dtype=np.float32
+    )
+    angle_step = PLAYER_VIEW_FOV / (PLAYER_NUM_RAYS - 1)
+    angles = np.radians(-PLAYER_VIEW_FOV / 2 + np.arange(PLAYER_NUM_RAYS) * angle_step)
+    observations[..., DIRECTION_FEATURES] = np.stack(
+        [np.cos(angles), np.sin(angles)], axis=-1
+    )
+    return observations
+
+
+def write_observations(out: np.ndarray, distances: np.ndarray, objects: np.ndarray):
+    """
+    Writes the (..., rays) distances and GameObject codes of the rays into
+    the distance and object features of the observations, in place.
+    """
+    out[..., DISTANCE_FEATURE] = distances
+    one_hot = out[..., OBJECT_FEATURES]
+    one_hot.fill(0)
+    np.put_along_axis(one_hot, objects[..., None].astype(np.intp), 1, axis=-1)
+
+
+def write_ray_observations(out: np.ndarray, rays: list[Ray]):
+    """
+    Writes the Ray models of one agent into its (rays, features) observation.
+    """
+    write_observations(
+        out,
+        np.array([ray.distance for ray in rays]),
+        np.array([ray.obj for ray in rays]),
+    )
@@ -0,0 +1,10 @@
+from .replay import ReplayPlayer, ReplayRecorder
+from .shared_state import SharedStateReader, SharedStateWriter, StateSnapshot
+
+__all__ = [
+    "ReplayPlayer",
+    "ReplayRecorder",
+    "SharedStateReader",
+    "SharedStateWriter",
+    "StateSnapshot",
+]
@@ -0,0 +1,308 @@
+import bisect
+import json
+import math
+import struct
+
+from src.actions import ACTION_TYPES, SHOOT, PlayerAction, WaitAction, action_code
+from src.agents.player import PlayerAgent
+from src.environment import GameEnvironment
+from src.geometry import Vector2D
+from src.interfaces import Action, Agent, SimulationObserver
+from src.map import GameMap, PlayerID, PlayerMapData
+from src.state import AgentStats, GameState, PendingShot
+
+MAGIC = b"MARLREPL"
+VERSION = 2
+
+# A replay is the magic, the version, a JSON header describing the match
+# and then a sequence of records, each starting with its kind and its tick
+_PREFIX = struct.Struct("<8sHI")  # magic, version, header length
+_RECORD = struct.Struct("<cI")
+_TICK_RECORD = b"T"  # one action code per agent, then the angle of each shot
+_KEYFRAME_RECORD = b"K"  # the full dynamic state of the match
+
+_ANGLE = struct.Struct("<d")
+_SHOT_COUNT = struct.Struct("<I")
+_AGENT = struct.Struct("<ddddBiH")  # position, direction, alive, delay, kills
+_KILL = struct.Struct("<H")
+_SHOT = struct.Struct("<Hddddi")  # shooter, origin, direction, remaining ticks
+
+
+class ReplayRecorder(SimulationObserver):
+    """
+    Records a match into a compact binary replay: the map and, for every
+    tick, one small action code per agent. Since the actions themselves are
+    recorded, the match replays the same whatever randomness the agents
+    used. Every keyframe_interval ticks the whole state is stored as well,
+    so that a ReplayPlayer can seek without re-simulating from the start.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        keyframe_interval: int = 100,
+        buffer_size: int = 1 << 16,
+    ):
+        self.path = path
+        self.keyframe_interval = keyframe_interval
+        self.buffer_size = buffer_size
+        self._file = None
+        self._index: dict[PlayerID, int] = {}
+
+    def on_start(self, state: GameState):
+        ray_caster = self._ray_caster_header(state)
+        self._index = dict(state.agents.index)
+        header = json.dumps(
+            {
+                "grid": self._initial_grid(state),
+                "player_ids": state.agents.player_ids,
+                "teams": {
+                    player_id: stats.map_data.team
+                    for player_id, stats in state.agent_stats.items()
+                },
+                "ray_caster": ray_caster,
+                "keyframe_interval": self.keyframe_interval,
+            }
+        ).encode()
+        self._file = open(self.path, "wb", buffering=self.buffer_size)
+        self._file.write(_PREFIX.pack(MAGIC, VERSION, len(header)))
+        self._file.write(header)
+        self._write_keyframe(state)
+
+    @staticmethod
+    def _ray_caster_header(state: GameState) -> dict | None:
+        """
+        The type and options of the ray caster of the state, which must be
+        one of src.ray_casters that can be rebuilt from its options, as
+        playback depends on its exact results.
+        """
+        from src import ray_casters
+
+        ray_caster = state.ray_caster
+        if ray_caster is None:
+            return None
+        name = type(ray_caster).__name__
+        options = ray_caster.options()
+        if getattr(ray_casters, name, None) is not type(ray_caster) or options is None:
+            raise ValueError(f"Matches using a {name} can't be recorded.")
+        return {"type": name, "options": options}
+
+    @staticmethod
+    def _initial_grid(state: GameState) -> list[str]:
+        """
+        The map as it would be read from a file: without its wall padding
+        and with the agents at the cells where they start.
+        """
+        grid = [list(row[1:-1]) for row in state.map.grid[1:-1]]
+        for stats in state.agent_stats.values():
+            position = stats.map_data.position
+            grid[round(position.y) - 1][round(position.x) - 1] = stats.map_data.team
+        return ["".join(row) for row in grid]
+
+    def on_step(self, state: GameState, actions: list[tuple[Agent, Action]]):
+        codes = bytearray(len(self._index))
+        angles = {}
+        for agent, action in actions:
+            if not isinstance(agent, PlayerAgent):
+                continue
+            idx = self._index[agent.player_id]
+            codes[idx] = action_code(action)
+            if codes[idx] == SHOOT:
+                angles[idx] = action.angle
+
+        self._file.write(_RECORD.pack(_TICK_RECORD, state.tick))
+        self._file.write(codes)
+        for idx in sorted(angles):
+            self._file.write(_ANGLE.pack(angles[idx]))
+        if state.tick % self.keyframe_interval == 0:
+            self._write_keyframe(state)
+
+    def _write_keyframe(self, state: GameState):
+        chunks = [
+            _RECORD.pack(_KEYFRAME_RECORD, state.tick),
+            _SHOT_COUNT.pack(len(state.pending_shots)),
+        ]
+        for stats in state.agent_stats.values():
+            position = stats.map_data.position
+            direction = stats.map_data.direction or Vector2D(x=math.nan, y=math.nan)
+            chunks.append(
+                _AGENT.pack(
+                    position.x,
+                    position.y,
+                    direction.x,
+                    direction.y,
+                    stats.is_alive,
+                    stats.shooting_delay,
+                    len(stats.kills),
+                )
+            )
+            chunks.extend(_KILL.pack(self._index[victim]) for victim in stats.kills)
+        for shot in state.pending_shots:
+            chunks.append(
+                _SHOT.pack(
+                    self._index[shot.player_id],
+                    shot.origin.x,
+                    shot.origin.y,
+                    shot.direction.x,
+                    shot.direction.y,
+                    shot.remaining_ticks,
+                )
+            )
+        self._file.write(b"".join(chunks))
+
+    def on_stop(self, state: GameState):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class ReplayPlayer:
+    """
+    Reads a replay written by ReplayRecorder and reconstructs the state of
+    any tick, by re-simulating headlessly from the closest keyframe before
+    it.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, header_length = _PREFIX.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a supported replay file.")
+        offset = _PREFIX.size
+        header = json.loads(data[offset : offset + header_length])
+        offset += header_length
+
+        self.grid: list[str] = header["grid"]
+        # Parsed once, every keyframe plays on a copy of it, all of them
+        # sharing its wall visibility cache
+        self._map = GameMap([list(row) for row in self.grid])
+        self._map.wall_visibility
+        self.player_ids: list[PlayerID] = header["player_ids"]
+        self.teams: dict[PlayerID, str] = header["teams"]
+        self.ray_caster: dict | None = header["ray_caster"]
+
+        # actions[tick] holds the actions that led from tick - 1 to tick
+        self.actions: list[list[PlayerAction]] = [[]]
+        self._keyframe_ticks: list[int] = []
+        self._keyframe_offsets: list[int] = []
+        while offset < len(data):
+            kind, tick = _RECORD.unpack_from(data, offset)
+            offset += _RECORD.size
+            if kind == _TICK_RECORD:
+                if tick != len(self.actions):
+                    raise ValueError(f"Missing ticks in the replay before {tick}.")
+                actions, offset = self._read_actions(data, offset)
+                self.actions.append(actions)
+            elif kind == _KEYFRAME_RECORD:
+                self._keyframe_ticks.append(tick)
+                self._keyframe_offsets.append(offset)
+                offset = self._skip_keyframe(data, offset)
+            else:
+                raise ValueError(f"Corrupted replay record at byte {offset}.")
+        self._data = data
+
+    @property
+    def num_ticks(self) -> int:
+        return len(self.actions) - 1
+
+    def _read_actions(self, data: bytes, offset: int) -> tuple[list, int]:
+        codes = data[offset : offset + len(self.player_ids)]
+        offset += len(self.player_ids)
+        actions = []
+        for code in codes:
+            if code == SHOOT:
+                (angle,) = _ANGLE.unpack_from(data, offset)
+                offset += _ANGLE.size
+                actions.append(ACTION_TYPES[code](angle=angle))
+            else:
+                actions.append(ACTION_TYPES[code]())
+        return actions, offset
+
+    def _skip_keyframe(self, data: bytes, offset: int) -> int:
+        (num_shots,) = _SHOT_COUNT.unpack_from(data, offset)
+        offset += _SHOT_COUNT.size
+        for _ in self.player_ids:
+            num_kills = _AGENT.unpack_from(data, offset)[-1]
+            offset += _AGENT.size + num_kills * _KILL.size
+        return offset + num_shots * _SHOT.size
+
+    def _ray_caster(self):
+        if self.ray_caster is None:
+            return None
+        from src import ray_casters
+
+        ray_caster_cls = getattr(ray_casters, self.ray_caster["type"])
+        return ray_caster_cls(**self.ray_caster["options"])
+
+    def _load_keyframe(self, position: int) -> GameState:
+        data = self._data
+        offset = self._keyframe_offsets[position]
+        game_map = self._map.model_copy(update={"players": {}})
+
+        (num_shots,) = _SHOT_COUNT.unpack_from(data, offset)
+        offset += _SHOT_COUNT.size
+        agent_stats = {}
+        for player_id in self.player_ids:
+            x, y, dir_x, dir_y, alive, delay, num_kills = _AGENT.unpack_from(
+                data, offset
+            )
+            offset += _AGENT.size
+            kills = []
+            for _ in range(num_kills):
+                kills.append(self.player_ids[_KILL.unpack_from(data, offset)[0]])
+                offset += _KILL.size
+            direction = None if math.isnan(dir_x) else Vector2D(x=dir_x, y=dir_y)
+            agent_stats[player_id] = AgentStats(
+                is_alive=alive,
+                shooting_delay=delay,
+                kills=kills,
+                map_data=PlayerMapData(
+                    player_id=player_id,
+                    team=self.teams[player_id],
+                    position=Vector2D(x=x, y=y),
+                    direction=direction,
+                ),
+                rays=[],
+            )
+
+        pending_shots = []
+        for _ in range(num_shots):
+            shooter, x, y, dir_x, dir_y, remaining = _SHOT.unpack_from(data, offset)
+            offset += _SHOT.size
+            pending_shots.append(
+                PendingShot(
+                    player_id=self.player_ids[shooter],
+                    origin=Vector2D(x=x, y=y),
+                    direction=Vector2D(x=dir_x, y=dir_y),
+                    remaining_ticks=remaining,
+                )
+            )
+
+        state = GameState(
+            tick=self._keyframe_ticks[position],
+            map=game_map,
+            agent_stats=agent_stats,
+            pending_shots=pending_shots,
+            ray_caster=self._ray_caster(),
+        )
+        state._update_rays()
+        return state
+
+    def state_at(self, tick: int) -> GameState:
+        if not 0 <= tick <= self.num_ticks:
+            raise ValueError(f"Tick {tick} is outside of the replay.")
+
+        position = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        env = GameEnvironment(state=self._load_keyframe(position))
+        players = [
+            PlayerAgent.model_construct(player_id=player_id)
+            for player_id in self.player_ids
+        ]
+        for replayed_tick in range(self._keyframe_ticks[position] + 1, tick + 1):
+            for player, action in zip(players, self.actions[replayed_tick]):
+                if not isinstance(action, WaitAction):
+                    env.update_state(player, action)
+            env.step()
+        return env.state
@@ -0,0 +1,240 @@
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from src.constants import PLAYER_NUM_RAYS
+from src.interfaces import Action, Agent, SimulationObserver
+from src.observations import DISTANCE_FEATURE, OBJECT_FEATURES
+from src.state import GameState
+
+
+class StateSnapshot:
+    """
+    Arrays describing a GameState at a tick, with room for up to max_agents
+    agents and max_shots shots: only the first num_agents and num_shots rows
+    are meaningful. Agents are in the order of GameState.agents.
+    """
+
+    # name -> (dtype, shape given (max_agents, max_shots, num_rays))
+    FIELDS = {
+        "config": (np.int64, lambda agents, shots, rays: (3,)),
+        "sequence": (np.uint64, lambda agents, shots, rays: (1,)),
+        "counts": (np.int64, lambda agents, shots, rays: (3,)),
+        "player_ids": ("S64", lambda agents, shots, rays: (agents,)),
+        "teams": ("S8", lambda agents, shots, rays: (agents,)),
+        "positions": (np.float64, lambda agents, shots, rays: (agents, 2)),
+        "directions": (np.float64, lambda agents, shots, rays: (agents, 2)),
+        "alive": (np.bool_, lambda agents, shots, rays: (agents,)),
+        "kills": (np.int32, lambda agents, shots, rays: (agents,)),
+        "ray_distances": (np.float32, lambda agents, shots, rays: (agents, rays)),
+        "ray_objects": (np.int8, lambda agents, shots, rays: (agents, rays)),
+        "shot_shooters": (np.int32, lambda agents, shots, rays: (shots,)),
+        "shot_origins": (np.float64, lambda agents, shots, rays: (shots, 2)),
+        "shot_directions": (np.float64, lambda agents, shots, rays: (shots, 2)),
+        "shot_remaining": (np.int32, lambda agents, shots, rays: (shots,)),
+    }
+    # Fields published every tick, the other ones are set up once
+    DATA_FIELDS = tuple(FIELDS)[2:]
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self.arrays = arrays
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    @property
+    def tick(self) -> int:
+        return int(self.counts[0])
+
+    @property
+    def num_agents(self) -> int:
+        return int(self.counts[1])
+
+    @property
+    def num_shots(self) -> int:
+        return int(self.counts[2])
+
+    @classmethod
+    def _shapes(cls, max_agents: int, max_shots: int, num_rays: int):
+        for name, (dtype, shape) in cls.FIELDS.items():
+            yield name, np.dtype(dtype), shape(max_agents, max_shots, num_rays)
+
+    @classmethod
+    def buffer_size(cls, max_agents: int, max_shots: int, num_rays: int) -> int:
+        size = 0
+        for _, dtype, shape in cls._shapes(max_agents, max_shots, num_rays):
+            size += -size % 8 + dtype.itemsize * int(np.prod(shape))
+        return size
+
+    @classmethod
+    def from_buffer(
+        cls, buffer, max_agents: int, max_shots: int, num_rays: int
+    ) -> "StateSnapshot":
+        """
+        Lays the arrays over the buffer, without copying.
+        """
+        arrays, offset = {}, 0
+        for name, dtype, shape in cls._shapes(max_agents, max_shots, num_rays):
+            offset += -offset % 8
+            arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            offset += arrays[name].nbytes
+        return cls(arrays)
+
+    @classmethod
+    def allocate(
+        cls, max_agents: int, max_shots: int, num_rays: int
+    ) -> "StateSnapshot":
+        return cls(
+            {
+                name: np.zeros(shape, dtype=dtype)
+                for name, dtype, shape in cls._shapes(max_agents, max_shots, num_rays)
+            }
+        )
+
+
+class SharedStateWriter(SimulationObserver):
+    """
+    Publishes the state of every tick into a shared memory segment with a
+    fixed layout, that other processes read with a SharedStateReader given
+    the segment's name. Writes are guarded by a sequence counter (a
+    seqlock): it is odd while a tick is being written, so readers never
+    block the simulation and detect torn reads by themselves.
+
+    Shots beyond max_shots are not published.
+    """
+
+    def __init__(self, max_agents: int, max_shots: int = 256, name: str | None = None):
+        self.max_agents = max_agents
+        self.max_shots = max_shots
+        self._memory = shared_memory.SharedMemory(
+            name=name,
+            create=True,
+            size=StateSnapshot.buffer_size(max_agents, max_shots, PLAYER_NUM_RAYS),
+        )
+        self._snapshot = StateSnapshot.from_buffer(
+            self._memory.buf, max_agents, max_shots, PLAYER_NUM_RAYS
+        )
+        self._snapshot.config[:] = max_agents, max_shots, PLAYER_NUM_RAYS
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    def on_start(self, state: GameState):
+        if len(state.agents) > self.max_agents:
+            raise ValueError(
+                f"The state has {len(state.agents)} agents, but the snapshots "
+                f"have room for {self.max_agents}."
+            )
+        self.publish(state)
+
+    def on_step(self, state: GameState, actions: list[tuple[Agent, Action]]):
+        self.publish(state)
+
+    def publish(self, state: GameState):
+        snapshot = self._snapshot
+        agents = state.agents
+        num_agents = len(agents)
+        shots = state.pending_shots[: self.max_shots]
+
+        snapshot.sequence[0] += 1
+        snapshot.counts[:] = state.tick, num_agents, len(shots)
+        snapshot.player_ids[:num_agents] = agents.player_ids
+        snapshot.teams[:num_agents] = [
+            agents.team_names[team] for team in agents.team.tolist()
+        ]
+        snapshot.positions[:num_agents] = agents.positions
+        snapshot.directions[:num_agents] = agents.directions
+        snapshot.alive[:num_agents] = agents.alive
+        snapshot.kills[:num_agents] = agents.kills
+
+        if state.observation_mode:
+            observations = state.observations
+            snapshot.ray_distances[:num_agents] = observations[..., DISTANCE_FEATURE]
+            snapshot.ray_objects[:num_agents] = observations[
+                ..., OBJECT_FEATURES
+            ].argmax(axis=-1)
+        else:
+            for idx, stats in enumerate(state.agent_stats.values()):
+                snapshot.ray_distances[idx] = [ray.distance for ray in stats.rays]
+                snapshot.ray_objects[idx] = [ray.obj for ray in stats.rays]
+
+        if shots:
+            snapshot.shot_shooters[: len(shots)] = [
+                agents.index[shot.player_id] for shot in shots
+            ]
+            snapshot.shot_origins[: len(shots)] = [
+                (shot.origin.x, shot.origin.y) for shot in shots
+            ]
+            snapshot.shot_directions[: len(shots)] = [
+                (shot.direction.x, shot.direction.y) for shot in shots
+            ]
+            snapshot.shot_remaining[: len(shots)] = [
+                shot.remaining_ticks for shot in shots
+            ]
+        snapshot.sequence[0] += 1
+
+    def close(self):
+        # The arrays must not reference the buffer anymore when closing it
+        del self._snapshot
+        self._memory.close()
+        self._memory.unlink()
+
+
+class SharedStateReader:
+    """
+    Attaches to the segment of a SharedStateWriter. snapshot exposes the
+    published arrays in place; read copies a consistent tick into
+    preallocated arrays, retrying while the writer is in the middle of one.
+    """
+
+    def __init__(self, name: str):
+        self._memory = self._attach(name)
+        config = np.ndarray((3,), dtype=np.int64, buffer=self._memory.buf)
+        self.max_agents, self.max_shots, self.num_rays = config.tolist()
+        del config
+        self.snapshot = StateSnapshot.from_buffer(
+            self._memory.buf, self.max_agents, self.max_shots, self.num_rays
+        )
+
+    @staticmethod
+    def _attach(name: str) -> shared_memory.SharedMemory:
+        # A process that is not related to the writer gets its own resource
+        # tracker, which would destroy the segment when the reader exits
+        tracked = resource_tracker._resource_tracker._fd is not None
+        memory = shared_memory.SharedMemory(name=name)
+        if not tracked:
+            resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
+
+    @property
+    def sequence(self) -> int:
+        """
+        Even once a tick is fully published, increasing with every tick. A
+        reader of snapshot in place compares it before and after reading.
+        """
+        return int(self.snapshot.sequence[0])
+
+    def allocate(self) -> StateSnapshot:
+        return StateSnapshot.allocate(self.max_agents, self.max_shots, self.num_rays)
+
+    def read(self, out: StateSnapshot | None = None) -> StateSnapshot:
+        """
+        Copies the last published tick into out, allocated if not given.
+        """
+        if out is None:
+            out = self.allocate()
+        while True:
+            sequence = self.sequence
+            if sequence % 2 == 1:
+                time.sleep(0)
+                continue
+            for name in StateSnapshot.DATA_FIELDS:
+                np.copyto(out.arrays[name], self.snapshot.arrays[name])
+            if self.sequence == sequence:
+                out.sequence[0] = sequence
+                return out
+
+    def close(self):
+        del self.snapshot
+        self._memory.close()
@@ -0,0 +1,199 @@
+import numpy as np
+
+from .actions import ACTION_TYPES, PlayerAction, WaitAction
+from .agents.player import PlayerAgent
+from .constants import PLAYER_NUM_RAYS
+from .environment import GameEnvironment
+from .interfaces import RayCaster
+from .map import GameMap, PlayerID
+from .observations import OBSERVATION_FEATURES
+from .ray_casters import GridTraversalRayCaster
+from .state import GameState
+
+
+class ParallelGameEnvironment:
+    """
+    Multi-agent training interface over a GameEnvironment, following the
+    parallel API of PettingZoo: every live agent acts at once, and step
+    returns dictionaries keyed by the agent ids. Observations are the
+    (PLAYER_NUM_RAYS, OBSERVATION_FEATURES) arrays of GameState.observations
+    and actions are either PlayerAction instances or the integer codes of
+    ACTION_TYPES (see src.actions), shots being fired straight ahead.
+
+    With a frame_skip above one, each call to step repeats the actions for
+    that many ticks, or until the match is over, and sums the rewards.
+    """
+
+    KILL_REWARD = 1.0
+    TEAM_KILL_REWARD = -1.0
+    DEATH_REWARD = -1.0
+    WIN_REWARD = 1.0  # given to every agent of the last team standing
+
+    observation_shape = (PLAYER_NUM_RAYS, OBSERVATION_FEATURES)
+    num_actions = len(ACTION_TYPES)
+
+    def __init__(
+        self,
+        game_map: GameMap,
+        max_ticks: int = 500,
+        frame_skip: int = 1,
+        ray_caster: RayCaster | None = None,
+    ):
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be at least 1.")
+        self.map = game_map
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.ray_caster = ray_caster or GridTraversalRayCaster()
+
+        # The map data of the players is moved by the game, so every reset
+        # starts from a copy of the map with a copy of the initial one. The
+        # given map itself is never modified.
+        self._initial_players = {
+            player_id: map_data.model_copy(deep=True)
+            for player_id, map_data in game_map.players.items()
+        }
+        self.possible_agents: list[PlayerID] = list(self._initial_players)
+        self.agents: list[PlayerID] = []
+        self.np_random = np.random.default_rng()
+        self.env: GameEnvironment | None = None
+        self._players = {
+            player_id: PlayerAgent.model_construct(player_id=player_id)
+            for player_id in self.possible_agents
+        }
+
+    @property
+    def state(self) -> GameState:
+        return self.env.state
+
+    def reset(
+        self, seed: int | None = None, options: dict | None = None
+    ) -> tuple[dict[PlayerID, np.ndarray], dict[PlayerID, dict]]:
+        """
+        Starts a new match and returns the observations and infos of every
+        agent. The game itself is deterministic, the seed only resets
+        np_random, for the policies that sample from it.
+        """
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+
+        game_map = self.map.model_copy(
+            update={
+                "players": {
+                    player_id: map_data.model_copy(deep=True)
+                    for player_id, map_data in self._initial_players.items()
+                }
+            }
+        )
+        self.env = GameEnvironment(
+            state=GameState(
+                map=game_map, ray_caster=self.ray_caster, observation_mode=True
+            )
+        )
+        self.agents = list(self.possible_agents)
+        return self._observations(self.agents), self._infos(self.agents)
+
+    def step(self, actions: dict[PlayerID, PlayerAction | int]) -> tuple[
+        dict[PlayerID, np.ndarray],
+        dict[PlayerID, float],
+        dict[PlayerID, bool],
+        dict[PlayerID, bool],
+        dict[PlayerID, dict],
+    ]:
+        """
+        Applies the actions of the live agents, the missing ones waiting,
+        and advances the match by frame_skip ticks. Returns the observations,
+        rewards, terminations, truncations and infos of the agents that were
+        live before the step. Agents are terminated when they die or when
+        their match is won, and truncated after max_ticks; they are then
+        removed from agents.
+        """
+        if self.env is None:
+            raise RuntimeError("reset must be called before step.")
+
+        stats = self.state.agent_stats
+        acting = list(self.agents)
+        player_actions = [
+            (player_id, self._player_action(actions.get(player_id, WaitAction())))
+            for player_id in acting
+        ]
+        rewards = dict.fromkeys(acting, 0.0)
+        kills_before = {player_id: len(stats[player_id].kills) for player_id in acting}
+
+        for _ in range(self.frame_skip):
+            for player_id, action in player_actions:
+                if stats[player_id].is_alive:
+                    self.env.update_state(self._players[player_id], action)
+            self.env.step()
+            if self._winner() is not None or self.state.tick >= self.max_ticks:
+                break
+
+        for player_id in acting:
+            for victim in stats[player_id].kills[kills_before[player_id] :]:
+                same_team = (
+                    stats[victim].map_data.team == stats[player_id].map_data.team
+                )
+                rewards[player_id] += (
+                    self.TEAM_KILL_REWARD if same_team else self.KILL_REWARD
+                )
+                if victim in rewards:
+                    rewards[victim] += self.DEATH_REWARD
+
+        winner = self._winner()
+        if winner is not None:
+            for player_id in acting:
+                if stats[player_id].map_data.team == winner:
+                    rewards[player_id] += self.WIN_REWARD
+        terminations = {
+            player_id: winner is not None or not stats[player_id].is_alive
+            for player_id in acting
+        }
+        truncations = dict.fromkeys(acting, self.state.tick >= self.max_ticks)
+
+        self.agents = [
+            player_id
+            for player_id in acting
+            if not terminations[player_id] and not truncations[player_id]
+        ]
+        return (
+            self._observations(acting),
+            rewards,
+            terminations,
+            truncations,
+            self._infos(acting),
+        )
+
+    @staticmethod
+    def _player_action(action: PlayerAction | int) -> PlayerAction:
+        if isinstance(action, PlayerAction):
+            return action
+        return ACTION_TYPES[action]()
+
+    def _winner(self) -> str | None:
+        """
+        The last team standing, if only one is left.
+        """
+        alive_teams = {
+            stats.map_data.team
+            for stats in self.state.agent_stats.values()
+            if stats.is_alive
+        }
+        return alive_teams.pop() if len(alive_teams) == 1 else None
+
+    def _observations(self, player_ids: list[PlayerID]) -> dict[PlayerID, np.ndarray]:
+        # The observations of the state are overwritten every tick
+        return {
+            player_id: self.state.observation(player_id).copy()
+            for player_id in player_ids
+        }
+
+    def _infos(self, player_ids: list[PlayerID]) -> dict[PlayerID, dict]:
+        stats = self.state.agent_stats
+        return {
+            player_id: {
+                "tick": self.state.tick,
+                "team": stats[player_id].map_data.team,
+                "kills": len(stats[player_id].kills),
+            }
+            for player_id in player_ids
+        }
@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+
+class TickProfiler:
+    """
+    Opt-in instrumentation of a running match. The simulation and the state
+    time their phases (perceiving, selecting actions, casting rays...) with
+    phase, optionally on behalf of an agent. The time spent in every phase is
+    summed per tick, the last window ticks being kept to compute rolling
+    percentiles, and every timed phase is kept as an event of a timeline
+    that can be exported to a Chrome/Perfetto trace.
+
+    Phases may be timed from several threads at once, like the ones of the
+    thread pool scheduler.
+    """
+
+    TICK = "tick"
+
+    def __init__(self, window: int = 500, max_events: int = 1 << 20):
+        self.window = window
+        self.ticks = 0
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter_ns()
+        self._tick_start: int | None = None
+        self._tick_totals: dict[str, int] = defaultdict(int)
+        self._history: dict[str, deque[int]] = {}
+        # (name, agent, tick, thread, start, duration), times in nanoseconds
+        self._events: deque[tuple] = deque(maxlen=max_events)
+
+    def begin_tick(self):
+        """
+        Starts timing a new tick, ending the current one if needed.
+        """
+        self.end_tick()
+        self.ticks += 1
+        self._tick_start = time.perf_counter_ns()
+
+    def end_tick(self):
+        if self._tick_start is None:
+            return
+        duration = time.perf_counter_ns() - self._tick_start
+        self._record(self.TICK, None, self._tick_start, duration)
+        with self._lock:
+            self._tick_totals[self.TICK] = duration
+            for key, total in self._tick_totals.items():
+                if key not in self._history:
+                    self._history[key] = deque(maxlen=self.window)
+                self._history[key].append(total)
+            self._tick_totals.clear()
+        self._tick_start = None
+
+    @contextmanager
+    def phase(self, name: str, agent: str | None = None):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self._record(name, agent, start, time.perf_counter_ns() - start)
+
+    def _record(self, name: str, agent: str | None, start: int, duration: int):
+        key = name if agent is None else f"{name}[{agent}]"
+        with self._lock:
+            if name != self.TICK:
+                self._tick_totals[key] += duration
+            self._events.append(
+                (name, agent, self.ticks, threading.get_ident(), start, duration)
+            )
+
+    def percentiles(
+        self, quantiles: tuple[float, ...] = (50, 90, 99)
+    ) -> dict[str, dict[str, float]]:
+        """
+        Returns, for every phase, the given percentiles in milliseconds of
+        the time spent in it per tick, over the last window ticks in which
+        it was timed.
+        """
+        with self._lock:
+            history = {key: np.array(values) for key, values in self._history.items()}
+        return {
+            key: {
+                f"p{quantile:g}": float(np.percentile(values, quantile)) / 1e6
+                for quantile in quantiles
+            }
+            for key, values in sorted(history.items())
+        }
+
+    def report(self, quantiles: tuple[float, ...] = (50, 90, 99)) -> str:
+        percentiles = self.percentiles(quantiles)
+        width = max((len(key) for key in percentiles), default=5) + 2
+        lines = [
+            f"{'phase':<{width}}"
+            + "".join(f"{f'p{quantile:g} (ms)':>12}" for quantile in quantiles)
+        ]
+        for key, values in percentiles.items():
+            lines.append(
+                f"{key:<{width}}"
+                + "".join(f"{value:>12.3f}" for value in values.values())
+            )
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, path: str):
+        """
+        Writes the recorded timeline in the Trace Event Format, which can be
+        opened in chrome://tracing or ui.perfetto.dev. Every thread that
+        timed a phase gets its own track.
+        """
+        with self._lock:
+            events = list(self._events)
+
+        threads: dict[int, int] = {}
+        trace = []
+        for name, agent, tick, thread, start, duration in events:
+            if thread not in threads:
+                threads[thread] = len(threads)
+                trace.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": 0,
+                        "tid": threads[thread],
+                        "args": {"name": f"thread {threads[thread]}"},
+                    }
+                )
+            args = {"tick": tick}
+            if agent is not None:
+                args["agent"] = agent
+            trace.append(
+                {
+                    "name": name if agent is None else f"{name} {agent}",
+                    "cat": name,
+                    "ph": "X",
+                    "pid": 0,
+                    "tid": threads[thread],
+                    "ts": (start - self._origin) / 1e3,
+                    "dur": duration / 1e3,
+                    "args": args,
+                }
+            )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+def profiled(profiler: TickProfiler | None, name: str, agent: str | None = None):
+    """
+    Times the phase with the profiler, or does nothing without one.
+    """
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name, agent)
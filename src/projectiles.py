@@ -0,0 +1,70 @@
+import numpy as np
+
+from .geometry import first_wall_distances, ray_circle_distances
+from .objects import PLAYER_DIAMETER
+from .spatial_hash import SpatialHash
+
+NO_TARGET = -1
+
+
+class ProjectileSystem:
+    """
+    Resolves one tick of movement of every in-flight shot at once. Each shot
+    sweeps a segment, which is intersected exactly with the wall squares and
+    with the agent circles; the first thing along the segment stops it.
+    """
+
+    @classmethod
+    def resolve(
+        cls,
+        wall_mask: np.ndarray,
+        spatial_index: SpatialHash,
+        positions: np.ndarray,
+        alive: np.ndarray,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        shooters: np.ndarray,
+        length: float,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sweeps the (shots, 2) origins along their unit directions by length.
+        Returns, for every shot, the index of the agent it killed (NO_TARGET
+        if none) and whether it was stopped by an agent or a wall.
+
+        Shots are resolved in order: when several shots reach the same agent,
+        the first one kills it and the others fly through its position. The
+        alive array is updated with the kills.
+        """
+        num_shots = len(origins)
+        wall_t = first_wall_distances(wall_mask, origins, directions, length)
+
+        # Any agent circle touching a segment has its center within
+        # length / 2 + radius of the segment's midpoint
+        radius = PLAYER_DIAMETER / 2
+        midpoints = origins + directions * (length / 2)
+        shots, agents = spatial_index.query_pairs(midpoints, length / 2 + radius)
+        keep = agents != shooters[shots]
+        shots, agents = shots[keep], agents[keep]
+
+        agent_t = ray_circle_distances(
+            origins[shots], directions[shots], positions[agents], radius
+        )
+        # Agents are tested before walls, so they win ties
+        reached = agent_t <= np.minimum(wall_t[shots], length)
+        shots, agents, agent_t = shots[reached], agents[reached], agent_t[reached]
+
+        order = np.lexsort((agents, agent_t, shots))
+        candidates = [[] for _ in range(num_shots)]
+        for shot, agent in zip(shots[order].tolist(), agents[order].tolist()):
+            candidates[shot].append(agent)
+
+        targets = np.full(num_shots, NO_TARGET, dtype=np.intp)
+        for shot, shot_candidates in enumerate(candidates):
+            for agent in shot_candidates:
+                if alive[agent]:
+                    alive[agent] = False
+                    targets[shot] = agent
+                    break
+
+        blocked = (targets != NO_TARGET) | (wall_t <= length)
+        return targets, blocked
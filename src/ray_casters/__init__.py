@@ -0,0 +1,5 @@
+from .batched_ray_caster import BatchedRayCaster
+from .grid_traversal_ray_caster import GridTraversalRayCaster
+from .numpy_ray_caster import NumpyRayCaster
+
+__all__ = ["BatchedRayCaster", "GridTraversalRayCaster", "NumpyRayCaster"]
@@ -0,0 +1,174 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from src.agent_store import NO_HEADING
+from src.constants import PLAYER_NUM_RAYS, PLAYER_RAY_LENGTH
+from src.headings import RAY_DIRECTIONS, RELATIVE_RAY_VECTORS
+from src.interfaces import RayCaster
+from src.map import PlayerID
+from src.objects import PLAYER_DIAMETER, GameObject, Ray
+from src.observations import write_observations
+from src.spatial_hash import SpatialHash
+from src.state import AGENT_QUERY_RADIUS, GameState
+
+
+class BatchedRayCaster(RayCaster, ABC):
+    """
+    Base class for the ray casters that handle the rays of every agent at
+    once. Subclasses only implement the intersection of the ray fans with
+    the world, the conversion from and to the state models is shared.
+    """
+
+    def __init__(self, max_batch_size: int = 1 << 22, wall_cache: bool = False):
+        # Upper bound on the number of (ray, target) tests done at once, used
+        # to split very crowded states into several batches.
+        self.max_batch_size = max_batch_size
+        # Whether the walls are looked up in the wall visibility cache of the
+        # map instead of being intersected, see WallVisibilityCache
+        self.wall_cache = wall_cache
+
+    def options(self) -> dict:
+        return {"max_batch_size": self.max_batch_size, "wall_cache": self.wall_cache}
+
+    def compute_rays(
+        self, state: GameState, agents: np.ndarray | None = None
+    ) -> dict[PlayerID, list[Ray]]:
+        distances, objects, headings, casters = self._cast_state(state, agents)
+        distances = distances.tolist()
+        objects = objects.tolist()
+        player_ids = state.agents.player_ids
+
+        return {
+            player_ids[agent]: [
+                Ray(
+                    distance=distances[row][ray],
+                    obj=GameObject(objects[row][ray]),
+                    direction=relative_directions[ray],
+                )
+                for ray in range(PLAYER_NUM_RAYS)
+            ]
+            for row, (agent, relative_directions) in enumerate(
+                zip(
+                    casters.tolist(),
+                    [RELATIVE_RAY_VECTORS[heading] for heading in headings.tolist()],
+                )
+            )
+        }
+
+    def compute_observations(
+        self, state: GameState, out: np.ndarray, agents: np.ndarray | None = None
+    ) -> None:
+        distances, objects, _, casters = self._cast_state(state, agents)
+        if len(casters) == 0:
+            return
+        if agents is None:
+            write_observations(out, distances, objects)
+            return
+        rows = out[casters]
+        write_observations(rows, distances, objects)
+        out[casters] = rows
+
+    def _cast_state(self, state: GameState, agents: np.ndarray | None) -> tuple:
+        """
+        Casts the rays of the given agents of the state, all of them when
+        None. Returns the distances and objects of their rays, their
+        headings and the indices of the agents.
+        """
+        store = state.agents
+        casters = np.arange(len(store)) if agents is None else np.asarray(agents)
+        headings = store.headings[casters]
+        if len(casters) == 0:
+            empty = np.empty((0, PLAYER_NUM_RAYS))
+            return empty, empty.astype(np.int8), headings, casters
+        if (headings == NO_HEADING).any():
+            raise ValueError("Invalid direction for one of the agents.")
+
+        wall_distances = None
+        if self.wall_cache:
+            wall_distances = state.map.wall_visibility.wall_distances(
+                store.positions[casters], headings
+            )
+        distances, objects = self.cast(
+            state.map.wall_mask,
+            state.spatial_index,
+            store.positions,
+            RAY_DIRECTIONS[headings],
+            store.alive,
+            store.team,
+            None if agents is None else casters,
+            wall_distances,
+        )
+        return distances, objects, headings, casters
+
+    @abstractmethod
+    def cast(
+        self,
+        wall_mask: np.ndarray,
+        spatial_index: SpatialHash,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        alive: np.ndarray,
+        team_ids: np.ndarray,
+        casters: np.ndarray | None = None,
+        wall_distances: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Intersects the (casters, rays) unit direction vectors with the world,
+        made of the walls of the mask and of the alive agents, which must all
+        be indexed by spatial_index. The rays are cast from the agents
+        whose indices are given in casters, or from every agent when None.
+        When given, the (casters, rays) distances to the first wall, infinite
+        beyond PLAYER_RAY_LENGTH, are used instead of the mask and only the
+        agents closer than them are tested.
+        Returns the hit distance of every ray, relative to PLAYER_RAY_LENGTH,
+        and the GameObject that was hit.
+        """
+        pass
+
+    @staticmethod
+    def _caster_ids(origins: np.ndarray, casters: np.ndarray | None) -> np.ndarray:
+        return np.arange(len(origins)) if casters is None else casters
+
+    @staticmethod
+    def _candidate_pairs(
+        spatial_index: SpatialHash,
+        origins: np.ndarray,
+        alive: np.ndarray,
+        caster_ids: np.ndarray,
+        wall_distances: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the (caster, target) pairs, sorted by caster, of the alive
+        targets that can be reached by at least one ray of the caster. The
+        casters are positions in caster_ids and the targets agent indices.
+        The pairs come from the spatial index, so sparse maps stay close to
+        O(agents). With the wall distances of the rays, the targets behind
+        the farthest wall seen by the caster are left out.
+        """
+        sources, targets = spatial_index.query_pairs(
+            origins[caster_ids], AGENT_QUERY_RADIUS
+        )
+        keep = (caster_ids[sources] != targets) & alive[targets]
+        sources, targets = sources[keep], targets[keep]
+        if wall_distances is None:
+            return sources, targets
+
+        reach = np.minimum(wall_distances.max(axis=-1), PLAYER_RAY_LENGTH)
+        offsets = origins[targets] - origins[caster_ids[sources]]
+        gaps = np.hypot(offsets[:, 0], offsets[:, 1]) - PLAYER_DIAMETER / 2
+        keep = gaps <= reach[sources]
+        return sources[keep], targets[keep]
+
+    def _batches(self, num_pairs: int, tests_per_pair: int):
+        batch = max(1, self.max_batch_size // tests_per_pair)
+        for start in range(0, num_pairs, batch):
+            yield start, min(start + batch, num_pairs)
+
+    @staticmethod
+    def _group_starts(sources: np.ndarray) -> np.ndarray:
+        """
+        Returns the index of the first pair of every caster in a sorted run
+        of pairs, to reduce the per-pair results with ufunc.reduceat.
+        """
+        return np.flatnonzero(np.r_[True, sources[1:] != sources[:-1]])
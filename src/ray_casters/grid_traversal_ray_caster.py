@@ -0,0 +1,116 @@
+import numpy as np
+
+from src.constants import PLAYER_NUM_RAYS, PLAYER_RAY_LENGTH
+from src.geometry import first_wall_distances, ray_circle_distances
+from src.objects import PLAYER_DIAMETER, GameObject
+from src.spatial_hash import SpatialHash
+
+from .batched_ray_caster import BatchedRayCaster
+
+
+class GridTraversalRayCaster(BatchedRayCaster):
+    """
+    Exact ray caster. Walls are found by walking the grid cells crossed by
+    each ray with a digital differential analyzer (DDA), and agents are
+    intersected analytically as circles of PLAYER_DIAMETER, so the reported
+    distances are not quantized and thin wall corners are never skipped.
+    """
+
+    def cast(
+        self,
+        wall_mask: np.ndarray,
+        spatial_index: SpatialHash,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        alive: np.ndarray,
+        team_ids: np.ndarray,
+        casters: np.ndarray | None = None,
+        wall_distances: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        caster_ids = self._caster_ids(origins, casters)
+        wall_t = wall_distances
+        if wall_t is None:
+            wall_t = first_wall_distances(
+                wall_mask, origins[caster_ids, None, :], directions, PLAYER_RAY_LENGTH
+            )
+        agent_t, agent_objects = self._agent_distances(
+            spatial_index,
+            origins,
+            directions,
+            alive,
+            team_ids,
+            caster_ids,
+            wall_distances,
+        )
+
+        # Walls win ties, like in the ray marcher where they are tested first
+        objects = np.where(
+            wall_t <= PLAYER_RAY_LENGTH, GameObject.WALL, GameObject.NONE
+        )
+        agent_hit = (agent_t < wall_t) & (agent_t <= PLAYER_RAY_LENGTH)
+        objects = np.where(agent_hit, agent_objects, objects)
+        distances = np.minimum(np.minimum(wall_t, agent_t), PLAYER_RAY_LENGTH)
+        return distances / PLAYER_RAY_LENGTH, objects
+
+    def _agent_distances(
+        self,
+        spatial_index: SpatialHash,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        alive: np.ndarray,
+        team_ids: np.ndarray,
+        caster_ids: np.ndarray,
+        wall_distances: np.ndarray | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the distance at which every ray enters the closest agent
+        circle, or infinity when no agent is hit, and the GameObject the hit
+        agent represents for the caster.
+        """
+        num_agents = len(origins)
+        hit_t = np.full(directions.shape[:-1], np.inf)
+        hit_targets = np.full(directions.shape[:-1], num_agents, dtype=np.intp)
+
+        sources, targets = self._candidate_pairs(
+            spatial_index, origins, alive, caster_ids, wall_distances
+        )
+        for start, stop in self._batches(len(sources), PLAYER_NUM_RAYS):
+            pair_sources = sources[start:stop]
+            pair_targets = targets[start:stop]
+            t = ray_circle_distances(
+                origins[caster_ids[pair_sources], None, :],
+                directions[pair_sources],
+                origins[pair_targets, None, :],
+                PLAYER_DIAMETER / 2,
+            )
+
+            # Closest hit of every caster ray, ties going to the first agent
+            starts = self._group_starts(pair_sources)
+            casters = pair_sources[starts]
+            closest_t = np.minimum.reduceat(t, starts, axis=0)
+            pair_group = np.repeat(
+                np.arange(len(starts)), np.diff(starts, append=len(t))
+            )
+            is_closest = np.isfinite(t) & (t == closest_t[pair_group])
+            closest_target = np.minimum.reduceat(
+                np.where(is_closest, pair_targets[:, None], num_agents), starts, axis=0
+            )
+
+            current_t = hit_t[casters]
+            current_target = hit_targets[casters]
+            better = (closest_t < current_t) | (
+                (closest_t == current_t) & (closest_target < current_target)
+            )
+            hit_t[casters] = np.where(better, closest_t, current_t)
+            hit_targets[casters] = np.where(better, closest_target, current_target)
+
+        agent_hit = hit_targets < num_agents
+        same_team = (
+            team_ids[np.where(agent_hit, hit_targets, 0)] == team_ids[caster_ids, None]
+        )
+        hit_objects = np.where(
+            agent_hit,
+            np.where(same_team, GameObject.TEAMMATE, GameObject.ENEMY),
+            GameObject.NONE,
+        )
+        return hit_t, hit_objects
@@ -1,3 +1,13 @@
-from .pygame_render_engine import PygameRenderEngine
+from .headless_render_engine import HeadlessRenderEngine
 
-__all__ = ["PygameRenderEngine"]
+__all__ = ["HeadlessRenderEngine", "PygameRenderEngine"]
+
+
+def __getattr__(name: str):
+    # pygame is only imported when its render engine is actually requested,
+    # so headless runs don't need it
+    if name == "PygameRenderEngine":
+        from .pygame_render_engine import PygameRenderEngine
+
+        return PygameRenderEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
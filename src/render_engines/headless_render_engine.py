@@ -0,0 +1,15 @@
+from src.interfaces.render_engine import RenderEngine
+from src.interfaces.state import State
+
+
+class HeadlessRenderEngine(RenderEngine):
+    """
+    Render engine that draws nothing and never waits, for batch runs. It
+    only counts the frames it was asked to display.
+    """
+
+    def __init__(self):
+        self.frames = 0
+
+    def display(self, state: State):
+        self.frames += 1
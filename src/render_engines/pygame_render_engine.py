@@ -1,19 +1,16 @@
 import time
 
 import pygame
-import math
 
 from src.interfaces.render_engine import RenderEngine
-from src.objects import WALL_SIZE, PLAYER_DIAMETER
+from src.objects import WALL_SIZE, PLAYER_DIAMETER, GameObject
 from src.simulations.exceptions import StopSimulationException
 from src.state import GameState
 from src.constants import (
-    PLAYER_VIEW_FOV,
-    PLAYER_NUM_RAYS,
     PLAYER_RAY_LENGTH,
     PLAYER_SHOOTING_LENGTH_PER_TICK,
 )
-from src.geometry import Vector2D
+from src.headings import RAY_VECTORS
 
 
 class PygameRenderEngine(RenderEngine):
@@ -33,7 +30,14 @@ class PygameRenderEngine(RenderEngine):
         "shoot_ray": (255, 50, 50),
     }
 
-    def __init__(self, clock_tick: int = 50, sleep_between_simulations: float = 0.05):
+    def __init__(
+        self,
+        clock_tick: int = 50,
+        sleep_between_simulations: float = 0.05,
+        frame_skip: int = 1,
+    ):
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be at least 1.")
         pygame.init()
         self.screen = None
         self.clock = pygame.time.Clock()
@@ -41,16 +45,30 @@ class PygameRenderEngine(RenderEngine):
         self.paused = False
         self.clock_tick = clock_tick
         self.sleep_between_simulations = sleep_between_simulations
+        # Only every frame_skip-th state is drawn, the others only handle the
+        # window events, without waiting
+        self.frame_skip = frame_skip
+        self._frames = 0
+        # The last state that was skipped, drawn on stop if no other state
+        # was drawn after it
+        self._skipped_state: GameState | None = None
+
+        # The grid and the walls never change during a match, so they are
+        # drawn once on this surface, which the dynamic layers are drawn
+        # over. The areas they covered in the last frame are the only ones
+        # restored and sent to the display on the next one.
+        self._static_layer: pygame.Surface | None = None
+        self._static_map = None
+        self._dirty_rects: list[pygame.Rect] = []
 
     def display(self, state: GameState):
-        self._setup_screen(state)
-        self._draw_grid(state)
-        self._draw_walls(state)
-        self._draw_agents(state)
-        self._draw_rays(state)
-        self._draw_tick(state)
-        self._draw_shots(state)
-        pygame.display.flip()
+        self._frames += 1
+        if (self._frames - 1) % self.frame_skip != 0:
+            self._skipped_state = state
+            self._listen_events()
+            return
+
+        self._draw_frame(state)
         self.clock.tick(self.clock_tick)
         self._listen_events()
 
@@ -60,19 +78,50 @@ class PygameRenderEngine(RenderEngine):
 
         time.sleep(self.sleep_between_simulations)
 
-    def _setup_screen(self, state: GameState):
+    def _draw_frame(self, state: GameState):
+        self._skipped_state = None
+        full_redraw = self._setup_screen(state)
+        if not full_redraw:
+            for rect in self._dirty_rects:
+                self.screen.blit(self._static_layer, rect, rect)
+        rects = [
+            *self._draw_agents(state),
+            *self._draw_rays(state),
+            self._draw_tick(state),
+            *self._draw_shots(state),
+        ]
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty_rects + rects)
+        self._dirty_rects = rects
+
+    def _setup_screen(self, state: GameState) -> bool:
+        """
+        Draws the static layer on the screen when the map changed, returning
+        whether the whole screen was redrawn.
+        """
+        if self._static_map is state.map:
+            return False
         width = state.map.width * self.CELL_SIZE
         height = state.map.height * self.CELL_SIZE + 30
-        if self.screen is None:
+        if self.screen is None or self.screen.get_size() != (width, height):
             self.screen = pygame.display.set_mode((width, height))
-        self.screen.fill(self.COLORS["background"])
+        self._static_layer = pygame.Surface((width, height)).convert()
+        self._static_layer.fill(self.COLORS["background"])
+        self._draw_grid(self._static_layer, state)
+        self._draw_walls(self._static_layer, state)
+        self._static_map = state.map
+        self.screen.blit(self._static_layer, (0, 0))
+        self._dirty_rects = []
+        return True
 
     def _coord_to_px(self, x: float | int, y: float | int):
         return int(x * self.CELL_SIZE + self.CELL_SIZE / 2), int(
             y * self.CELL_SIZE + self.CELL_SIZE / 2
         )
 
-    def _draw_grid(self, state: GameState):
+    def _draw_grid(self, surface: pygame.Surface, state: GameState):
         for x in range(state.map.width):
             for y in range(state.map.height):
                 rect = pygame.Rect(
@@ -81,10 +130,10 @@ class PygameRenderEngine(RenderEngine):
                     self.CELL_SIZE * WALL_SIZE,
                     self.CELL_SIZE * WALL_SIZE,
                 )
-                pygame.draw.rect(self.screen, self.COLORS["empty"], rect)
-                pygame.draw.rect(self.screen, (200, 200, 200), rect, 1)
+                pygame.draw.rect(surface, self.COLORS["empty"], rect)
+                pygame.draw.rect(surface, (200, 200, 200), rect, 1)
 
-    def _draw_walls(self, state: GameState):
+    def _draw_walls(self, surface: pygame.Surface, state: GameState):
         for wall in state.map.walls:
             rect = pygame.Rect(
                 int(wall.x * self.CELL_SIZE),
@@ -92,12 +141,11 @@ class PygameRenderEngine(RenderEngine):
                 self.CELL_SIZE,
                 self.CELL_SIZE,
             )
-            pygame.draw.rect(self.screen, self.COLORS["wall"], rect)
-
-    def _draw_agents(self, state: GameState):
-        for player_id in state.agent_stats.keys():
-            agent_stats = state.agent_stats[player_id]
+            pygame.draw.rect(surface, self.COLORS["wall"], rect)
 
+    def _draw_agents(self, state: GameState) -> list[pygame.Rect]:
+        rects = []
+        for agent_stats in state.agent_stats.values():
             if not agent_stats.is_alive:
                 color = self.COLORS["dead"]
             else:
@@ -105,69 +153,75 @@ class PygameRenderEngine(RenderEngine):
                     f"team_{agent_stats.map_data.team.lower()}", (255, 0, 0)
                 )
 
-            pygame.draw.circle(
-                self.screen,
-                color,
-                self._coord_to_px(
-                    agent_stats.map_data.position.x, agent_stats.map_data.position.y
-                ),
-                (self.CELL_SIZE * PLAYER_DIAMETER) // 2,
+            rects.append(
+                pygame.draw.circle(
+                    self.screen,
+                    color,
+                    self._coord_to_px(
+                        agent_stats.map_data.position.x,
+                        agent_stats.map_data.position.y,
+                    ),
+                    (self.CELL_SIZE * PLAYER_DIAMETER) // 2,
+                )
             )
+        return rects
 
-    def _draw_rays(self, state: GameState):
-        for player_id, agent_stats in state.agent_stats.items():
+    def _draw_rays(self, state: GameState) -> list[pygame.Rect]:
+        rects = []
+        for agent_stats in state.agent_stats.values():
             if not agent_stats.is_alive or len(agent_stats.rays) == 0:
                 continue
 
-            origin = agent_stats.map_data.position
-            direction = agent_stats.map_data.direction
-            if direction is None:
+            heading = agent_stats.map_data.heading
+            if heading is None:
                 continue
+            origin = agent_stats.map_data.position
+            origin_px = self._coord_to_px(origin.x, origin.y)
 
-            base_angle = direction.base_angle()
-            start_angle = base_angle - (PLAYER_VIEW_FOV / 2)
-            angle_step = PLAYER_VIEW_FOV / (PLAYER_NUM_RAYS - 1)
-
-            for i, ray in enumerate(agent_stats.rays):
-                angle = start_angle + i * angle_step
-                dx = math.cos(math.radians(angle))
-                dy = math.sin(math.radians(angle))
-                ray_direction = Vector2D(x=dx, y=dy)
-
-                hit_pos = origin + ray_direction * (ray.distance * PLAYER_RAY_LENGTH)
-
-                if ray.obj.name == "WALL":
+            for ray, ray_direction in zip(agent_stats.rays, RAY_VECTORS[heading]):
+                length = ray.distance * PLAYER_RAY_LENGTH
+                if ray.obj == GameObject.WALL:
                     color = self.COLORS["ray_wall"]
-                elif ray.obj.name in ("ENEMY", "TEAMMATE"):
+                elif ray.obj in (GameObject.ENEMY, GameObject.TEAMMATE):
                     color = self.COLORS["ray_agent"]
                 else:
                     color = self.COLORS["ray_none"]
 
-                pygame.draw.line(
-                    self.screen,
-                    color,
-                    self._coord_to_px(origin.x, origin.y),
-                    self._coord_to_px(hit_pos.x, hit_pos.y),
-                    2,
+                rects.append(
+                    pygame.draw.line(
+                        self.screen,
+                        color,
+                        origin_px,
+                        self._coord_to_px(
+                            origin.x + ray_direction.x * length,
+                            origin.y + ray_direction.y * length,
+                        ),
+                        2,
+                    )
                 )
+        return rects
 
-    def _draw_shots(self, state: GameState):
+    def _draw_shots(self, state: GameState) -> list[pygame.Rect]:
+        rects = []
         for shot in state.pending_shots:
             origin = shot.origin
             direction = shot.direction
             end = origin + direction * PLAYER_SHOOTING_LENGTH_PER_TICK
 
-            pygame.draw.line(
-                self.screen,
-                self.COLORS["shoot_ray"],
-                self._coord_to_px(origin.x, origin.y),
-                self._coord_to_px(end.x, end.y),
-                4,  # thickness
+            rects.append(
+                pygame.draw.line(
+                    self.screen,
+                    self.COLORS["shoot_ray"],
+                    self._coord_to_px(origin.x, origin.y),
+                    self._coord_to_px(end.x, end.y),
+                    4,  # thickness
+                )
             )
+        return rects
 
-    def _draw_tick(self, state: GameState):
+    def _draw_tick(self, state: GameState) -> pygame.Rect:
         tick_text = self.font.render(f"Tick: {state.tick}", True, (0, 0, 0))
-        self.screen.blit(tick_text, (5, state.map.height * self.CELL_SIZE + 5))
+        return self.screen.blit(tick_text, (5, state.map.height * self.CELL_SIZE + 5))
 
     def _listen_events(self):
         for event in pygame.event.get():
@@ -178,6 +232,8 @@ class PygameRenderEngine(RenderEngine):
                     self.paused = not self.paused
 
     def stop(self):
+        if self._skipped_state is not None:
+            self._draw_frame(self._skipped_state)
         self.paused = True
         while self.paused:
             self._listen_events()
@@ -1,4 +1,19 @@
 from .base_simulation import BaseSimulation
 from .game_simulation import GameSimulation
+from .match_result import MatchResult
+from .schedulers import (
+    Scheduler,
+    SequentialScheduler,
+    ThreadPerAgentScheduler,
+    ThreadPoolScheduler,
+)
 
-__all__ = ["BaseSimulation", "GameSimulation"]
+__all__ = [
+    "BaseSimulation",
+    "GameSimulation",
+    "MatchResult",
+    "Scheduler",
+    "SequentialScheduler",
+    "ThreadPerAgentScheduler",
+    "ThreadPoolScheduler",
+]
@@ -1,26 +1,18 @@
-import multiprocessing
-import threading
 from abc import ABC, abstractmethod
+from typing import Any
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.interfaces.action import Action
 from src.interfaces.agent import Agent
 from src.interfaces.environment import Environment
 from src.interfaces.render_engine import RenderEngine
+from src.interfaces.simulation_observer import SimulationObserver
+from src.profiler import TickProfiler, profiled
+from src.render_engines.headless_render_engine import HeadlessRenderEngine
 
 from .exceptions import StopSimulationException
-
-
-def agent_step(agent, env, results):
-    percept = env.get_percept(agent)
-    agent.see(percept)
-    action = agent.select_action()
-    results.append((agent, action))
-
-
-def update_state_step(env, agent, action):
-    env.update_state(agent, action)
+from .schedulers import Scheduler, SequentialScheduler
 
 
 class BaseSimulation(BaseModel, ABC):
@@ -33,34 +25,45 @@ class BaseSimulation(BaseModel, ABC):
 
     agents: list[Agent]
     env: Environment
-    render_engine: RenderEngine
+    render_engine: RenderEngine = Field(default_factory=HeadlessRenderEngine)
+    scheduler: Scheduler = Field(default_factory=SequentialScheduler)
+    observers: list[SimulationObserver] = []
+    profiler: TickProfiler | None = None
 
     def simulation_step(self, pending_actions: list[tuple[Agent, Action]]):
-        threads = []
-        results = []
-        for agent in self.agents:
-            thread = threading.Thread(
-                target=agent_step, args=(agent, self.env, results)
-            )
-            thread.start()
-            threads.append(thread)
-        for thread in threads:
-            thread.join()
-
-        threads = []
-        for agent, action in results:
-            thread = threading.Thread(
-                target=update_state_step, args=(self.env, agent, action)
-            )
-            thread.start()
-            threads.append(thread)
-        for thread in threads:
-            thread.join()
-
-        self.env.step()
-        self.render_engine.display(self.env.state)
+        self._advance()
+        with profiled(self.profiler, "render"):
+            self.render_engine.display(self.env.state)
         return pending_actions
 
+    def _advance(self):
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.begin_tick()
+
+        # Actions are applied in the order of the agents, regardless of how
+        # the scheduler ran them, so that a tick is deterministic
+        with profiled(profiler, "select_actions"):
+            actions = self.scheduler.select_actions(self.agents, self.env, profiler)
+        with profiled(profiler, "update_state"):
+            for agent, action in actions:
+                self.env.update_state(agent, action)
+        with profiled(profiler, "env_step"):
+            self.env.step()
+        with profiled(profiler, "observers"):
+            for observer in self.observers:
+                observer.on_step(self.env.state, actions)
+
+    def _notify_start(self):
+        for observer in self.observers:
+            observer.on_start(self.env.state)
+
+    def _notify_stop(self):
+        if self.profiler is not None:
+            self.profiler.end_tick()
+        for observer in self.observers:
+            observer.on_stop(self.env.state)
+
     def start(self):
         """
         Runs the simulation starting from a given state. This consists of a
@@ -70,12 +73,39 @@ class BaseSimulation(BaseModel, ABC):
         self.render_engine.display(self.env.state)
         pending_actions: list[tuple[Agent, Action]] = []
 
+        self._notify_start()
         try:
             while not self.is_complete():
                 pending_actions = self.simulation_step(pending_actions)
             self.render_engine.stop()
         except StopSimulationException:
             pass
+        finally:
+            self.scheduler.shutdown()
+            self._notify_stop()
+
+    def run(self) -> Any:
+        """
+        Runs the simulation to completion as fast as possible, without
+        displaying it, and returns its result.
+        """
+        self._notify_start()
+        try:
+            while not self.is_complete():
+                self._advance()
+        except StopSimulationException:
+            pass
+        finally:
+            self.scheduler.shutdown()
+            self._notify_stop()
+        return self.get_result()
+
+    def get_result(self) -> Any:
+        """
+        Summarizes the outcome of the simulation. Simulations without a
+        meaningful result return None.
+        """
+        return None
 
     @abstractmethod
     def is_complete(self) -> bool:
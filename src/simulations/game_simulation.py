@@ -1,4 +1,5 @@
 from .base_simulation import BaseSimulation
+from .match_result import MatchResult
 from src.environment import GameEnvironment
 
 
@@ -6,6 +7,11 @@ class GameSimulation(BaseSimulation):
     env: GameEnvironment
     max_simulations: int = 500
 
+    def _notify_start(self):
+        # The state times the phases of its own step
+        self.env.state.profiler = self.profiler
+        super()._notify_start()
+
     def is_complete(self) -> bool:
         if self.env.state.tick >= self.max_simulations:
             return True
@@ -18,3 +24,27 @@ class GameSimulation(BaseSimulation):
                 return False
             alive_teams.add(agent_stats.map_data.team)
         return True
+
+    def get_result(self) -> MatchResult:
+        state = self.env.state
+        alive_teams = {
+            stats.map_data.team
+            for stats in state.agent_stats.values()
+            if stats.is_alive
+        }
+        return MatchResult(
+            winner=alive_teams.pop() if len(alive_teams) == 1 else None,
+            ticks=state.tick,
+            teams={
+                player_id: stats.map_data.team
+                for player_id, stats in state.agent_stats.items()
+            },
+            kills={
+                player_id: len(stats.kills)
+                for player_id, stats in state.agent_stats.items()
+            },
+            alive={
+                player_id: stats.is_alive
+                for player_id, stats in state.agent_stats.items()
+            },
+        )
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from src.map import PlayerID
+
+
+class MatchResult(BaseModel):
+    winner: str | None  # the last team standing, None for a draw or timeout
+    ticks: int
+    teams: dict[PlayerID, str]
+    kills: dict[PlayerID, int]
+    alive: dict[PlayerID, bool]
@@ -0,0 +1,122 @@
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+from src.interfaces.action import Action
+from src.interfaces.agent import Agent
+from src.interfaces.environment import Environment
+from src.profiler import TickProfiler
+
+
+def agent_step(
+    agent: Agent, env: Environment, profiler: TickProfiler | None = None
+) -> Action:
+    if profiler is None:
+        percept = env.get_percept(agent)
+        agent.see(percept)
+        return agent.select_action()
+
+    label = getattr(agent, "player_id", type(agent).__name__)
+    with profiler.phase("percept", label):
+        percept = env.get_percept(agent)
+        agent.see(percept)
+    with profiler.phase("select_action", label):
+        return agent.select_action()
+
+
+class Scheduler(ABC):
+    """
+    Decides how the agents of a simulation perceive and select their actions
+    each tick. Whatever the execution strategy, the selected actions are
+    returned in the order of the agents, so that the simulation can apply
+    them deterministically.
+    """
+
+    @abstractmethod
+    def select_actions(
+        self,
+        agents: list[Agent],
+        env: Environment,
+        profiler: TickProfiler | None = None,
+    ) -> list[tuple[Agent, Action]]:
+        pass
+
+    def shutdown(self):
+        """
+        Releases the resources held by the scheduler. It can still be used
+        afterwards, in which case they are acquired again.
+        """
+        pass
+
+
+class SequentialScheduler(Scheduler):
+    """
+    Runs the agents one after the other on the calling thread. This is the
+    fastest option when agents are cheap, as it has no synchronization cost.
+    """
+
+    def select_actions(
+        self,
+        agents: list[Agent],
+        env: Environment,
+        profiler: TickProfiler | None = None,
+    ) -> list[tuple[Agent, Action]]:
+        return [(agent, agent_step(agent, env, profiler)) for agent in agents]
+
+
+class ThreadPoolScheduler(Scheduler):
+    """
+    Runs the agents concurrently on a pool of worker threads that is kept
+    alive between ticks, for agents that spend their time waiting (e.g. on
+    I/O or on native code releasing the GIL).
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+
+    def select_actions(
+        self,
+        agents: list[Agent],
+        env: Environment,
+        profiler: TickProfiler | None = None,
+    ) -> list[tuple[Agent, Action]]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = [
+            self._executor.submit(agent_step, agent, env, profiler) for agent in agents
+        ]
+        return [(agent, future.result()) for agent, future in zip(agents, futures)]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class ThreadPerAgentScheduler(Scheduler):
+    """
+    Starts one new thread per agent every tick. Kept as a reference point for
+    the scheduling overhead of the other schedulers.
+    """
+
+    def select_actions(
+        self,
+        agents: list[Agent],
+        env: Environment,
+        profiler: TickProfiler | None = None,
+    ) -> list[tuple[Agent, Action]]:
+        actions: list[Action | None] = [None] * len(agents)
+
+        def run(idx: int, agent: Agent):
+            actions[idx] = agent_step(agent, env, profiler)
+
+        threads = [
+            threading.Thread(target=run, args=(idx, agent))
+            for idx, agent in enumerate(agents)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return list(zip(agents, actions))
@@ -0,0 +1,118 @@
+import math
+
+import numpy as np
+
+
+class SpatialHash:
+    """
+    Uniform grid index over a set of points, used to find the agents close to
+    a point or segment without scanning all of them. Items are the integer
+    indices of the points given to rebuild. Queries return candidates: every
+    item within the query radius is included, sorted by index, but items
+    slightly further away may be returned as well.
+    """
+
+    # Cell coordinates are packed into a single int64 key
+    _KEY_OFFSET = 1 << 20
+    _KEY_STRIDE = 1 << 21
+
+    def __init__(self, cell_size: float):
+        self.cell_size = cell_size
+        self._keys = np.empty(0, dtype=np.int64)
+        self._items = np.empty(0, dtype=np.intp)
+        self._positions = np.empty((0, 2))
+        self._buckets: dict[int, list[int]] = {}
+
+    def _key(self, cell_x, cell_y):
+        return (cell_x + self._KEY_OFFSET) * self._KEY_STRIDE + (
+            cell_y + self._KEY_OFFSET
+        )
+
+    def rebuild(self, positions: np.ndarray, mask: np.ndarray | None = None):
+        """
+        Indexes the (n, 2) positions, skipping the ones excluded by the mask.
+        """
+        self._positions = positions.copy()
+        items = np.arange(len(positions)) if mask is None else np.flatnonzero(mask)
+        cells = np.floor(positions[items] / self.cell_size).astype(np.int64)
+        keys = self._key(cells[:, 0], cells[:, 1])
+
+        order = np.argsort(keys, kind="stable")
+        self._keys = keys[order]
+        self._items = items[order]
+
+        unique_keys, starts = np.unique(self._keys, return_index=True)
+        bounds = np.append(starts, len(self._keys)).tolist()
+        items = self._items.tolist()
+        self._buckets = {
+            key: items[bounds[idx] : bounds[idx + 1]]
+            for idx, key in enumerate(unique_keys.tolist())
+        }
+
+    def _query_box(
+        self, min_x: float, min_y: float, max_x: float, max_y: float
+    ) -> list[int]:
+        start_x = math.floor(min_x / self.cell_size)
+        start_y = math.floor(min_y / self.cell_size)
+        stop_x = math.floor(max_x / self.cell_size)
+        stop_y = math.floor(max_y / self.cell_size)
+
+        found = []
+        for cell_x in range(start_x, stop_x + 1):
+            for cell_y in range(start_y, stop_y + 1):
+                found.extend(self._buckets.get(self._key(cell_x, cell_y), ()))
+        found.sort()
+        return found
+
+    def query_point(self, x: float, y: float, radius: float) -> list[int]:
+        return self._query_box(x - radius, y - radius, x + radius, y + radius)
+
+    def query_segment(
+        self, x0: float, y0: float, x1: float, y1: float, radius: float
+    ) -> list[int]:
+        return self._query_box(
+            min(x0, x1) - radius,
+            min(y0, y1) - radius,
+            max(x0, x1) + radius,
+            max(y0, y1) + radius,
+        )
+
+    def query_pairs(
+        self, points: np.ndarray, radius: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized query of many points at once. Returns the (query, item)
+        pairs whose distance is below the radius, sorted by query and item.
+        """
+        span = math.ceil(radius / self.cell_size)
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+
+        queries, items = [], []
+        for offset_x in range(-span, span + 1):
+            for offset_y in range(-span, span + 1):
+                keys = self._key(cells[:, 0] + offset_x, cells[:, 1] + offset_y)
+                low = np.searchsorted(self._keys, keys, side="left")
+                high = np.searchsorted(self._keys, keys, side="right")
+                counts = high - low
+                total = counts.sum()
+                if total == 0:
+                    continue
+
+                # Expand every [low, high) range into the positions it covers
+                ends = np.cumsum(counts)
+                positions = np.arange(total) + np.repeat(low - (ends - counts), counts)
+                queries.append(np.repeat(np.arange(len(points)), counts))
+                items.append(self._items[positions])
+
+        if not queries:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+
+        queries = np.concatenate(queries)
+        items = np.concatenate(items)
+        gaps = points[queries] - self._positions[items]
+        close = np.hypot(gaps[:, 0], gaps[:, 1]) < radius
+        queries, items = queries[close], items[close]
+
+        order = np.lexsort((items, queries))
+        return queries[order], items[order]
@@ -1,17 +1,22 @@
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
+from .agent_store import AgentStore
 from .constants import (
-    PLAYER_VIEW_FOV,
-    PLAYER_NUM_RAYS,
     PLAYER_RAY_LENGTH,
     RAY_TRACER_STEPS,
     PLAYER_SHOOTING_DURATION_TICKS,
     PLAYER_SHOOTING_LENGTH_PER_TICK,
 )
-from .geometry import Vector2D
-from .interfaces import State
+from .geometry import FastVector2D, Vector2D
+from .headings import RAY_VECTORS, RELATIVE_RAY_VECTORS
+from .interfaces import RayCaster, State
 from .map import GameMap, PlayerID, PlayerMapData
-from .objects import GameObject, CollisionDetector, Ray
+from .objects import PLAYER_DIAMETER, GameObject, CollisionDetector, Ray
+from .observations import allocate_observations, write_ray_observations
+from .profiler import TickProfiler, profiled
+from .projectiles import NO_TARGET, ProjectileSystem
+from .spatial_hash import SpatialHash
 
 
 class AgentStats(BaseModel):
@@ -29,55 +34,230 @@ class PendingShot(BaseModel):
     remaining_ticks: int = PLAYER_SHOOTING_DURATION_TICKS
 
 
+# Agents further away than this from an agent can't be hit by its rays
+AGENT_QUERY_RADIUS = PLAYER_RAY_LENGTH + PLAYER_DIAMETER / 2
+
+
 class GameState(State):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     tick: int = 0
     map: GameMap
     agent_stats: dict[PlayerID, AgentStats] = {}
     pending_shots: list[PendingShot] = []
+    ray_caster: RayCaster | None = None  # None uses the built-in ray marcher
+    # Casts the rays into the observations array instead of Ray models. Only
+    # the agents with supports_observation_mode can run in it: among the
+    # built-in ones, RandomPlayerAgent does, while DummyPlayerAgent,
+    # TacticalPlayerAgent and ModeratorAgent read Ray models and don't
+    observation_mode: bool = False
+    profiler: TickProfiler | None = Field(default=None, exclude=True)
+    # Only re-casts the rays that may have changed since the last tick, see
+    # _dirty_agents; the results are the same as when casting all of them
+    incremental_rays: bool = True
+
+    _agents: AgentStore = PrivateAttr()
+    _spatial_index: SpatialHash = PrivateAttr()
+    _observations: np.ndarray | None = PrivateAttr(default=None)
+    # What the rays were last cast with: the ray caster, the observation
+    # mode and the positions, headings and alive flags of the agents
+    _last_cast: tuple | None = PrivateAttr(default=None)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.agent_stats = kwargs.get(
-            "agent_stats",
-            {
-                player_id: AgentStats(
-                    map_data=map_data, rays=self._compute_rays_for_agent(map_data)
-                )
-                for player_id, map_data in self.map.players.items()
-            },
+        self._spatial_index = SpatialHash(cell_size=AGENT_QUERY_RADIUS)
+        if "agent_stats" in kwargs:
+            self._agents = AgentStore.from_agent_stats(self.agent_stats)
+            self._spatial_index.rebuild(self._agents.positions)
+            return
+
+        self.agent_stats = {
+            player_id: AgentStats(map_data=map_data, rays=[])
+            for player_id, map_data in self.map.players.items()
+        }
+        self._agents = AgentStore.from_agent_stats(self.agent_stats)
+        self._spatial_index.rebuild(self._agents.positions)
+        self._update_rays()
+
+    @property
+    def agents(self) -> AgentStore:
+        """
+        Array view of the agent stats, synchronized with them once per tick.
+        """
+        return self._agents
+
+    @property
+    def spatial_index(self) -> SpatialHash:
+        """
+        Index of the positions of every agent, dead ones included, at the
+        last synchronization, whose items are the agent indices of
+        GameState.agents. Positions only change between ticks, so it holds
+        for the whole tick.
+        """
+        return self._spatial_index
+
+    @property
+    def observations(self) -> np.ndarray:
+        """
+        The (agents, rays, OBSERVATION_FEATURES) float32 observations of the
+        agents, in agent order. In observation mode they are overwritten in
+        place every tick and the rays of the agent stats are left empty.
+        """
+        if self._observations is None:
+            self._update_observations()
+        return self._observations
+
+    def observation(self, player_id: PlayerID) -> np.ndarray:
+        """
+        View of the (rays, OBSERVATION_FEATURES) observation of one agent.
+        """
+        return self.observations[self._agents.index[player_id]]
+
+    def agents_near(self, point: Vector2D, radius: float) -> list[PlayerID]:
+        """
+        Returns the ids of the alive agents closer than radius to the point.
+        """
+        return [
+            player_id
+            for player_id, stats in self._indexed_agents(
+                self._spatial_index.query_point(point.x, point.y, radius)
+            )
+            if stats.is_alive
+            and CollisionDetector.distance(point, stats.map_data.position) < radius
+        ]
+
+    def _indexed_agents(self, indices: list[int]) -> list[tuple[PlayerID, AgentStats]]:
+        player_ids = self._agents.player_ids
+        return [(player_ids[idx], self.agent_stats[player_ids[idx]]) for idx in indices]
+
+    def _sync_agents(self):
+        if len(self._agents) != len(self.agent_stats):
+            self._agents = AgentStore.from_agent_stats(self.agent_stats)
+        else:
+            self._agents.pull(self.agent_stats)
+        self._spatial_index.rebuild(self._agents.positions)
+
+    def _compute_all_rays(
+        self, agents: np.ndarray | None = None
+    ) -> dict[PlayerID, list[Ray]]:
+        if self.ray_caster is not None:
+            return self.ray_caster.compute_rays(self, agents)
+        player_ids = self._agents.player_ids
+        if agents is not None:
+            player_ids = [player_ids[agent] for agent in agents.tolist()]
+        return {
+            player_id: self._compute_rays_for_agent(
+                self.agent_stats[player_id].map_data
+            )
+            for player_id in player_ids
+        }
+
+    def _update_rays(self):
+        agents = self._dirty_agents()
+        if agents is None or len(agents) > 0:
+            if self.observation_mode:
+                self._update_observations(agents)
+            else:
+                for player_id, rays in self._compute_all_rays(agents).items():
+                    self.agent_stats[player_id].rays = rays
+
+        store = self._agents
+        self._last_cast = (
+            self.ray_caster,
+            self.observation_mode,
+            store.positions.copy(),
+            store.headings.copy(),
+            store.alive.copy(),
         )
 
-    def _compute_rays_for_agent(self, player_data: PlayerMapData) -> list[Ray]:
-        origin = player_data.position
-        direction = player_data.direction
-        if direction is None:
-            raise ValueError("Invalid direction for one of the agents.")
+    def _dirty_agents(self) -> np.ndarray | None:
+        """
+        Returns the indices of the agents whose rays may differ from the ones
+        cast last time, or None when all of them must be cast. Walls don't
+        move, so the rays of an agent only change with its own pose or when
+        an agent within AGENT_QUERY_RADIUS of it moves, dies or revives.
+        """
+        if not self.incremental_rays or self._last_cast is None:
+            return None
+        ray_caster, observation_mode, positions, headings, alive = self._last_cast
+        agents = self._agents
+        if (
+            ray_caster is not self.ray_caster
+            or observation_mode != self.observation_mode
+            or len(positions) != len(agents)
+        ):
+            return None
 
-        base_angle = direction.base_angle()
-        start_angle = base_angle - (PLAYER_VIEW_FOV / 2)
-        angle_step = PLAYER_VIEW_FOV / (PLAYER_NUM_RAYS - 1)
+        moved = (agents.positions != positions).any(axis=-1)
+        dirty = moved | (agents.headings != headings)
+        changed = moved | (agents.alive != alive)
+        if not changed.any():
+            return np.flatnonzero(dirty)
 
-        rays = []
-        for i in range(PLAYER_NUM_RAYS):
-            angle = start_angle + i * angle_step
-            ray_dir = Vector2D.from_angle(angle)
-            ray = self._cast_single_ray(origin, ray_dir, player_data)
-            rays.append(ray)
+        # Targets matter both where they were and where they are now
+        before = np.flatnonzero(changed & alive)
+        after = np.flatnonzero(changed & agents.alive)
+        targets = np.concatenate([before, after])
+        queries, casters = self._spatial_index.query_pairs(
+            np.concatenate([positions[before], agents.positions[after]]),
+            AGENT_QUERY_RADIUS * (1 + 1e-9),
+        )
+        dirty[casters[targets[queries] != casters]] = True
+        return np.flatnonzero(dirty)
 
-        return rays
+    def _update_observations(self, agents: np.ndarray | None = None):
+        num_agents = len(self._agents)
+        if self._observations is None or len(self._observations) != num_agents:
+            self._observations = allocate_observations(num_agents)
+            agents = None
+        if self.ray_caster is not None:
+            self.ray_caster.compute_observations(self, self._observations, agents)
+            return
+        for agent, rays in zip(
+            range(num_agents) if agents is None else agents.tolist(),
+            self._compute_all_rays(agents).values(),
+        ):
+            write_ray_observations(self._observations[agent], rays)
+
+    def _compute_rays_for_agent(self, player_data: PlayerMapData) -> list[Ray]:
+        heading = player_data.heading
+        if heading is None:
+            raise ValueError("Invalid direction for one of the agents.")
+        origin = FastVector2D.from_model(player_data.position)
+        nearby = self._indexed_agents(
+            self._spatial_index.query_point(origin.x, origin.y, AGENT_QUERY_RADIUS)
+        )
+
+        return [
+            self._cast_single_ray(origin, ray_dir, player_data, nearby, relative_dir)
+            for ray_dir, relative_dir in zip(
+                RAY_VECTORS[heading], RELATIVE_RAY_VECTORS[heading]
+            )
+        ]
 
     def _cast_single_ray(
-        self, origin: Vector2D, direction: Vector2D, player_data: PlayerMapData
+        self,
+        origin: FastVector2D,
+        direction: FastVector2D,
+        player_data: PlayerMapData,
+        nearby: list[tuple[PlayerID, AgentStats]] | None = None,
+        ray_direction: Vector2D | None = None,
     ) -> Ray:
-        ray_direction = Vector2D.from_angle(
-            direction.base_angle() - player_data.direction.base_angle()
-        )
+        """
+        Marches the ray from the origin along the direction. The direction
+        of the ray relative to the player's heading is computed when not
+        given.
+        """
+        if ray_direction is None:
+            ray_direction = FastVector2D.from_angle(
+                direction.base_angle() - player_data.direction.base_angle()
+            ).to_model()
 
         for step in range(1, RAY_TRACER_STEPS + 1):
             t = (step / RAY_TRACER_STEPS) * PLAYER_RAY_LENGTH
             point = origin + direction * t
 
-            obj = self._check_collision(point, player_data)
+            obj = self._check_collision(point, player_data, nearby)
             if obj != GameObject.NONE:
                 return Ray(
                     distance=t / PLAYER_RAY_LENGTH,
@@ -88,17 +268,22 @@ class GameState(State):
         return Ray(distance=1.0, obj=GameObject.NONE, direction=ray_direction)
 
     def _check_collision(
-        self, point: Vector2D, player_data: PlayerMapData
+        self,
+        point: FastVector2D,
+        player_data: PlayerMapData,
+        nearby: list[tuple[PlayerID, AgentStats]] | None = None,
     ) -> GameObject:
-        for wall in self.map.nearest_walls(point):
-            if CollisionDetector.check_collision_point_wall(point, wall):
-                return GameObject.WALL
-
-        for other_id, other_stats in self.agent_stats.items():
-            if (
-                other_id == player_data.player_id
-                or not self.agent_stats[other_id].is_alive
-            ):
+        """
+        Returns the object at the given point. When given, only the nearby
+        agents, in agent_stats order, are tested instead of all of them.
+        """
+        if self.map.point_in_wall(point.x, point.y):
+            return GameObject.WALL
+
+        if nearby is None:
+            nearby = self.agent_stats.items()
+        for other_id, other_stats in nearby:
+            if other_id == player_data.player_id or not other_stats.is_alive:
                 continue
             if CollisionDetector.check_collision_point_player(
                 point, other_stats.map_data.position
@@ -111,58 +296,55 @@ class GameState(State):
 
         return GameObject.NONE
 
-    def _compute_updated_bullets(self):
-        updated_shots = []
-
-        for shot in self.pending_shots:
-            origin = shot.origin
-            direction = shot.direction
-            end = origin + direction * PLAYER_SHOOTING_LENGTH_PER_TICK
-
-            hit = self._ray_hits_object(origin, end, shot.player_id)
-            if not hit and shot.remaining_ticks > 1:
-                updated_shots.append(
-                    PendingShot(
-                        player_id=shot.player_id,
-                        origin=end,
-                        direction=direction,
-                        remaining_ticks=shot.remaining_ticks - 1,
-                    )
-                )
-
-        return updated_shots
-
-    def _ray_hits_object(
-        self, origin: Vector2D, end: Vector2D, shooter_id: str
-    ) -> bool:
-        for step in range(1, RAY_TRACER_STEPS + 1):
-            t = step / RAY_TRACER_STEPS
-            point = origin + (end - origin) * t
-
-            for other_id, other_stats in self.agent_stats.items():
-                if other_id == shooter_id:
-                    continue
-                if not other_stats.is_alive:
-                    continue
+    def _advance_shots(self):
+        """
+        Moves every pending shot by one tick, in place. Shots that hit an
+        agent or a wall, or that ran out of ticks, are removed.
+        """
+        shots = self.pending_shots
+        if not shots:
+            return
 
-                if CollisionDetector.check_collision_point_player(
-                    point, other_stats.map_data.position
-                ):
-                    other_stats.is_alive = False
-                    self.agent_stats[shooter_id].kills.append(other_id)
-                    return True
+        agents = self._agents
+        origins = np.array([(shot.origin.x, shot.origin.y) for shot in shots])
+        directions = np.array([(shot.direction.x, shot.direction.y) for shot in shots])
+        shooters = np.array([agents.index[shot.player_id] for shot in shots])
+        targets, blocked = ProjectileSystem.resolve(
+            self.map.wall_mask,
+            self._spatial_index,
+            agents.positions,
+            agents.alive,
+            origins,
+            directions,
+            shooters,
+            PLAYER_SHOOTING_LENGTH_PER_TICK,
+        )
 
-            for wall in self.map.nearest_walls(point):
-                if CollisionDetector.check_collision_point_wall(point, wall):
-                    return True
+        in_flight = []
+        for shot, target, is_blocked in zip(shots, targets.tolist(), blocked.tolist()):
+            if target != NO_TARGET:
+                target_id = agents.player_ids[target]
+                self.agent_stats[target_id].is_alive = False
+                self.agent_stats[shot.player_id].kills.append(target_id)
+                agents.kills[agents.index[shot.player_id]] += 1
+            if is_blocked or shot.remaining_ticks <= 1:
+                continue
 
-        return False
+            shot.origin.x += shot.direction.x * PLAYER_SHOOTING_LENGTH_PER_TICK
+            shot.origin.y += shot.direction.y * PLAYER_SHOOTING_LENGTH_PER_TICK
+            shot.remaining_ticks -= 1
+            in_flight.append(shot)
+        shots[:] = in_flight
 
     def step(self):
-        self.pending_shots = self._compute_updated_bullets()
-        for player_id, player_stats in self.agent_stats.items():
-            stats = self.agent_stats[player_id]
-            if stats.shooting_delay > 0:
-                stats.shooting_delay -= 1
-            player_stats.rays = self._compute_rays_for_agent(player_stats.map_data)
+        profiler = self.profiler
+        with profiled(profiler, "sync_agents"):
+            self._sync_agents()
+        with profiled(profiler, "shots"):
+            self._advance_shots()
+        with profiled(profiler, "cooldowns"):
+            self._agents.tick_cooldowns()
+            self._agents.push(self.agent_stats)
+        with profiled(profiler, "rays"):
+            self._update_rays()
         self.tick += 1
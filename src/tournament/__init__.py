@@ -0,0 +1,18 @@
+from .match import AGENT_TYPES, MatchRecord, MatchSpec, run_match
+from .statistics import Estimate, RunningMean, wilson_interval
+from .summary import AgentSummary, TournamentStatistics, TournamentSummary
+from .tournament import Tournament
+
+__all__ = [
+    "AGENT_TYPES",
+    "AgentSummary",
+    "Estimate",
+    "MatchRecord",
+    "MatchSpec",
+    "RunningMean",
+    "Tournament",
+    "TournamentStatistics",
+    "TournamentSummary",
+    "run_match",
+    "wilson_interval",
+]
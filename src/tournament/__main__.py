@@ -0,0 +1,71 @@
+"""
+Plays a tournament headlessly and prints the aggregated statistics.
+
+Usage: python -m src.tournament --map maps/level1.txt \
+    --lineup B=TacticalPlayerAgent,Y=RandomPlayerAgent --seeds 100
+"""
+
+import argparse
+import sys
+
+from .tournament import Tournament
+
+
+def parse_lineup(value: str) -> dict[str, str]:
+    lineup = {}
+    for assignment in value.split(","):
+        team, _, agent = assignment.partition("=")
+        lineup[team.strip()] = agent.strip()
+    return lineup
+
+
+def format_estimate(estimate) -> str:
+    return f"{estimate.mean:8.3f} [{estimate.low:.3f}, {estimate.high:.3f}]"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--map", dest="maps", action="append", required=True)
+    parser.add_argument(
+        "--lineup", dest="lineups", action="append", type=parse_lineup, required=True
+    )
+    parser.add_argument("--seeds", type=int, default=10)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--max-ticks", type=int, default=500)
+    parser.add_argument("--moderator-probability", type=float, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--chunksize", type=int, default=None)
+    args = parser.parse_args()
+
+    tournament = Tournament(
+        maps=args.maps,
+        lineups=args.lineups,
+        seeds=list(range(args.first_seed, args.first_seed + args.seeds)),
+        max_ticks=args.max_ticks,
+        moderator_probability=args.moderator_probability,
+        processes=args.processes,
+        chunksize=args.chunksize,
+    )
+    total = len(tournament.matches())
+
+    def progress(record):
+        progress.done += 1
+        print(f"\r{progress.done}/{total} matches", end="", file=sys.stderr)
+
+    progress.done = 0
+    summary = tournament.run(on_result=progress)
+    print(file=sys.stderr)
+
+    print(f"matches: {summary.matches}, draws: {summary.draws}")
+    print(f"match length (ticks): {format_estimate(summary.match_length)}")
+    print(f"{'agent':<22}{'teams':>6}{'wins':>6}  {'win rate':<26}team kills")
+    for agent, stats in summary.agents.items():
+        print(
+            f"{agent:<22}{stats.appearances:>6}{stats.wins:>6}  "
+            f"{format_estimate(stats.win_rate):<26}"
+            f"{format_estimate(stats.team_kills_per_match)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import random
+
+from pydantic import BaseModel
+
+from src.agents.dummy_player.dummy_player import DummyPlayerAgent
+from src.agents.moderator.agent import ModeratorAgent
+from src.agents.player import PlayerAgent
+from src.agents.random_player import RandomPlayerAgent
+from src.agents.tactical_player.tactical_player import TacticalPlayerAgent
+from src.blackboard import Blackboard
+from src.blackboard_backends import LocalBlackboardBackend
+from src.environment import GameEnvironment
+from src.map import GameMap
+from src.ray_casters import NumpyRayCaster
+from src.simulations import GameSimulation, MatchResult
+from src.state import GameState
+
+# Agents are referred to by class name, so that match specs stay plain data
+AGENT_TYPES: dict[str, type[PlayerAgent]] = {
+    agent_cls.__name__: agent_cls
+    for agent_cls in (
+        PlayerAgent,
+        RandomPlayerAgent,
+        DummyPlayerAgent,
+        TacticalPlayerAgent,
+    )
+}
+
+
+class MatchSpec(BaseModel):
+    map_path: str
+    lineup: dict[str, str]  # team -> agent type, PlayerAgent if missing
+    seed: int
+    max_ticks: int = 500
+    moderator_probability: float | None = None  # None plays without moderator
+
+
+class MatchRecord(BaseModel):
+    spec: MatchSpec
+    result: MatchResult
+
+    def agent_of(self, team: str) -> str:
+        return self.spec.lineup.get(team, PlayerAgent.__name__)
+
+
+def run_match(spec: MatchSpec) -> MatchRecord:
+    """
+    Plays a match headlessly. Matches with the same spec play out the same.
+    """
+    random.seed(spec.seed)
+    game_map = GameMap.load(spec.map_path)
+    blackboard = Blackboard(backend=LocalBlackboardBackend())
+
+    agents = []
+    for player_id, data in game_map.players.items():
+        agent_cls = AGENT_TYPES[spec.lineup.get(data.team, PlayerAgent.__name__)]
+        agents.append(agent_cls(player_id=player_id, blackboard=blackboard))
+    if spec.moderator_probability is not None:
+        agents.append(
+            ModeratorAgent(
+                blackboard=blackboard, probability=spec.moderator_probability
+            )
+        )
+
+    simulation = GameSimulation(
+        agents=agents,
+        env=GameEnvironment(state=GameState(map=game_map, ray_caster=NumpyRayCaster())),
+        max_simulations=spec.max_ticks,
+    )
+    return MatchRecord(spec=spec, result=simulation.run())
@@ -0,0 +1,59 @@
+import math
+
+from pydantic import BaseModel
+
+# Two-sided 95% confidence
+DEFAULT_Z = 1.96
+
+
+class Estimate(BaseModel):
+    mean: float
+    low: float
+    high: float
+
+
+def wilson_interval(successes: int, trials: int, z: float = DEFAULT_Z) -> Estimate:
+    """
+    Wilson score interval of a binomial proportion, which unlike the normal
+    approximation stays inside [0, 1] and behaves for rates close to 0 or 1.
+    """
+    if trials == 0:
+        return Estimate(mean=math.nan, low=math.nan, high=math.nan)
+    rate = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (rate + z**2 / (2 * trials)) / denominator
+    half_width = (
+        z * math.sqrt(rate * (1 - rate) / trials + z**2 / (4 * trials**2)) / denominator
+    )
+    return Estimate(mean=rate, low=center - half_width, high=center + half_width)
+
+
+class RunningMean:
+    """
+    Streaming mean and variance (Welford's algorithm), so that statistics
+    can be updated as results arrive without keeping them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._squares = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._squares += delta * (value - self.mean)
+
+    def estimate(self, z: float = DEFAULT_Z) -> Estimate:
+        """
+        Normal approximation interval of the mean, undefined for fewer than
+        two values.
+        """
+        if self.count < 2:
+            mean = self.mean if self.count else math.nan
+            return Estimate(mean=mean, low=math.nan, high=math.nan)
+        half_width = z * math.sqrt(self._squares / (self.count - 1) / self.count)
+        return Estimate(
+            mean=self.mean, low=self.mean - half_width, high=self.mean + half_width
+        )
@@ -0,0 +1,64 @@
+from pydantic import BaseModel
+
+from .match import MatchRecord
+from .statistics import Estimate, RunningMean, wilson_interval
+
+
+class AgentSummary(BaseModel):
+    appearances: int  # one per team played in a match
+    wins: int
+    win_rate: Estimate
+    team_kills_per_match: Estimate  # kills of the whole team it played
+
+
+class TournamentSummary(BaseModel):
+    matches: int
+    draws: int  # no single team left standing, including timeouts
+    match_length: Estimate  # ticks
+    agents: dict[str, AgentSummary]
+
+
+class TournamentStatistics:
+    """
+    Aggregates match records as they are streamed back from the workers.
+    """
+
+    def __init__(self):
+        self.matches = 0
+        self.draws = 0
+        self._match_length = RunningMean()
+        self._appearances: dict[str, int] = {}
+        self._wins: dict[str, int] = {}
+        self._kills: dict[str, RunningMean] = {}
+
+    def add(self, record: MatchRecord):
+        result = record.result
+        self.matches += 1
+        self.draws += result.winner is None
+        self._match_length.add(result.ticks)
+
+        team_kills: dict[str, int] = {}
+        for player_id, team in result.teams.items():
+            team_kills[team] = team_kills.get(team, 0) + result.kills[player_id]
+
+        for team, kills in team_kills.items():
+            agent = record.agent_of(team)
+            self._appearances[agent] = self._appearances.get(agent, 0) + 1
+            self._wins[agent] = self._wins.get(agent, 0) + (result.winner == team)
+            self._kills.setdefault(agent, RunningMean()).add(kills)
+
+    def summary(self) -> TournamentSummary:
+        return TournamentSummary(
+            matches=self.matches,
+            draws=self.draws,
+            match_length=self._match_length.estimate(),
+            agents={
+                agent: AgentSummary(
+                    appearances=appearances,
+                    wins=self._wins[agent],
+                    win_rate=wilson_interval(self._wins[agent], appearances),
+                    team_kills_per_match=self._kills[agent].estimate(),
+                )
+                for agent, appearances in sorted(self._appearances.items())
+            },
+        )
@@ -0,0 +1,82 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterator
+
+from pydantic import BaseModel
+
+from src.map import GameMap
+
+from .match import AGENT_TYPES, MatchRecord, MatchSpec, run_match
+from .summary import TournamentStatistics, TournamentSummary
+
+
+def run_matches(specs: list[MatchSpec]) -> list[MatchRecord]:
+    return [run_match(spec) for spec in specs]
+
+
+class Tournament(BaseModel):
+    """
+    Plays every lineup on every map with every seed, spread over a pool of
+    worker processes. Matches are sent to the workers in chunks to amortize
+    the inter-process communication, and their results are streamed back in
+    completion order.
+    """
+
+    maps: list[str]
+    lineups: list[dict[str, str]]  # team -> agent type
+    seeds: list[int]
+    max_ticks: int = 500
+    moderator_probability: float | None = None
+    processes: int | None = None  # defaults to the number of CPUs
+    chunksize: int | None = None
+
+    def matches(self) -> list[MatchSpec]:
+        for lineup in self.lineups:
+            for agent in lineup.values():
+                if agent not in AGENT_TYPES:
+                    raise ValueError(f"Unknown agent type: {agent}")
+
+        return [
+            MatchSpec(
+                map_path=map_path,
+                lineup=lineup,
+                seed=seed,
+                max_ticks=self.max_ticks,
+                moderator_probability=self.moderator_probability,
+            )
+            for map_path, lineup, seed in itertools.product(
+                self.maps, self.lineups, self.seeds
+            )
+        ]
+
+    def results(self) -> Iterator[MatchRecord]:
+        specs = self.matches()
+        # Compiled once here, so the workers only load the compiled maps
+        for map_path in self.maps:
+            GameMap.load(map_path, compile=True)
+        processes = self.processes or os.cpu_count() or 1
+        if processes == 1:
+            yield from map(run_match, specs)
+            return
+
+        # Same default as multiprocessing.Pool.map: about four chunks per worker
+        chunksize = self.chunksize or max(1, math.ceil(len(specs) / (4 * processes)))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(run_matches, specs[start : start + chunksize])
+                for start in range(0, len(specs), chunksize)
+            ]
+            for future in as_completed(futures):
+                yield from future.result()
+
+    def run(
+        self, on_result: Callable[[MatchRecord], None] | None = None
+    ) -> TournamentSummary:
+        statistics = TournamentStatistics()
+        for record in self.results():
+            statistics.add(record)
+            if on_result is not None:
+                on_result(record)
+        return statistics.summary()
@@ -0,0 +1,309 @@
+import math
+
+import numpy as np
+
+from .actions import FORWARD, SHOOT, TURN_LEFT, TURN_RIGHT
+from .constants import (
+    PLAYER_FORWARD_DISTANCE,
+    PLAYER_NUM_RAYS,
+    PLAYER_SHOOTING_DELAY_TICKS,
+    PLAYER_SHOOTING_DURATION_TICKS,
+    PLAYER_SHOOTING_LENGTH_PER_TICK,
+)
+from .geometry import circles_hit_walls
+from .headings import HEADING_DIRECTIONS, NUM_HEADINGS, RAY_DIRECTIONS
+from .map import GameMap, PlayerID
+from .objects import PLAYER_DIAMETER
+from .observations import (
+    OBSERVATION_FEATURES,
+    allocate_observations,
+    write_observations,
+)
+from .projectiles import NO_TARGET, ProjectileSystem
+from .ray_casters import BatchedRayCaster, GridTraversalRayCaster
+from .spatial_hash import SpatialHash
+from .state import AGENT_QUERY_RADIUS
+from .wall_visibility import WallVisibilityCache
+
+
+class VectorGameEnvironment:
+    """
+    Many independent matches advanced in lockstep, for training. The maps of
+    all the matches are laid side by side in a single wall mask, and all
+    their agents live in the same flat arrays, so a step moves, turns,
+    shoots and casts the rays of every agent of every match with a handful
+    of array operations. The rules are the ones of GameEnvironment and
+    GameState, with the actions given as the integer codes of ACTION_TYPES
+    (see src.actions) and shots always fired straight ahead. Since the maps
+    are offset, rays passing exactly through a wall corner may be rounded
+    to the other side of it than in a lone GameState.
+
+    Arrays given to and returned by step are indexed by (match, slot), the
+    slot being the position of the agent in its map's players. Matches with
+    fewer agents than the largest one have unused slots, see agent_mask.
+    Matches are reset automatically once they are over.
+    """
+
+    KILL_REWARD = 1.0
+    TEAM_KILL_REWARD = -1.0
+    DEATH_REWARD = -1.0
+
+    # Empty cells between two maps, so that no agent, ray or shot of a match
+    # is ever a spatial index candidate of another one
+    _MAP_GAP = math.ceil(AGENT_QUERY_RADIUS + PLAYER_SHOOTING_LENGTH_PER_TICK)
+
+    def __init__(
+        self,
+        maps: list[GameMap],
+        max_ticks: int = 500,
+        ray_caster: BatchedRayCaster | None = None,
+    ):
+        if not maps:
+            raise ValueError("At least one map is required.")
+        self.max_ticks = max_ticks
+        self.ray_caster = ray_caster or GridTraversalRayCaster()
+        self.num_matches = len(maps)
+
+        self.player_ids: list[list[PlayerID]] = []
+        self.teams: list[list[str]] = []
+        self._build_world(maps)
+        self._wall_visibility = (
+            WallVisibilityCache(self.wall_mask) if self.ray_caster.wall_cache else None
+        )
+        self.max_agents = max(len(player_ids) for player_ids in self.player_ids)
+        self.agent_mask = np.zeros((self.num_matches, self.max_agents), dtype=bool)
+        self.agent_mask[self.match, self.slot] = True
+
+        self.ticks = np.zeros(self.num_matches, dtype=np.int64)
+        self.positions = self._initial_positions.copy()
+        self.headings = self._initial_headings.copy()
+        self.alive = np.ones(len(self.match), dtype=bool)
+        self.shooting_delay = np.zeros(len(self.match), dtype=np.int32)
+        self._clear_shots()
+        self._agent_observations = allocate_observations(len(self.match))
+        self._spatial_index = SpatialHash(cell_size=AGENT_QUERY_RADIUS)
+
+    def _build_world(self, maps: list[GameMap]):
+        height = max(game_map.height for game_map in maps)
+        width = sum(game_map.width for game_map in maps)
+        self.wall_mask = np.zeros(
+            (height, width + self._MAP_GAP * (len(maps) - 1)), dtype=bool
+        )
+
+        match, slot, teams, positions, headings = [], [], [], [], []
+        offset_x = 0
+        for idx, game_map in enumerate(maps):
+            self.wall_mask[: game_map.height, offset_x : offset_x + game_map.width] = (
+                game_map.wall_mask
+            )
+            players = list(game_map.players.values())
+            self.player_ids.append([player.player_id for player in players])
+            self.teams.append([player.team for player in players])
+            for player_slot, player in enumerate(players):
+                match.append(idx)
+                slot.append(player_slot)
+                teams.append(player.team)
+                positions.append((player.position.x + offset_x, player.position.y))
+                headings.append(player.heading)
+            offset_x += game_map.width + self._MAP_GAP
+
+        self.match = np.array(match, dtype=np.intp)
+        self.slot = np.array(slot, dtype=np.intp)
+        team_names, team = np.unique(np.array(teams, dtype=str), return_inverse=True)
+        self._num_teams = len(team_names)
+        self.team = team.astype(np.intp).reshape(len(match))
+        self._initial_positions = np.array(positions, dtype=float).reshape(-1, 2)
+        self._initial_headings = np.array(headings, dtype=np.intp)
+        self._match_bounds = np.searchsorted(
+            self.match, np.arange(self.num_matches + 1)
+        )
+
+    def _clear_shots(self):
+        self._shot_origins = np.empty((0, 2))
+        self._shot_directions = np.empty((0, 2))
+        self._shot_shooters = np.empty(0, dtype=np.intp)
+        self._shot_remaining = np.empty(0, dtype=np.int64)
+
+    def reset(self) -> np.ndarray:
+        """
+        Resets every match and returns their initial observations.
+        """
+        for match in range(self.num_matches):
+            self._reset_match(match)
+        self._spatial_index.rebuild(self.positions, self.alive)
+        return self._observations()
+
+    def _reset_match(self, match: int):
+        agents = slice(self._match_bounds[match], self._match_bounds[match + 1])
+        self.positions[agents] = self._initial_positions[agents]
+        self.headings[agents] = self._initial_headings[agents]
+        self.alive[agents] = True
+        self.shooting_delay[agents] = 0
+        self.ticks[match] = 0
+
+        keep = self.match[self._shot_shooters] != match
+        self._shot_origins = self._shot_origins[keep]
+        self._shot_directions = self._shot_directions[keep]
+        self._shot_shooters = self._shot_shooters[keep]
+        self._shot_remaining = self._shot_remaining[keep]
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Applies the (matches, max_agents) integer actions and advances every
+        match by one tick. Returns the (matches, max_agents, PLAYER_NUM_RAYS,
+        OBSERVATION_FEATURES) observations, with the features of
+        GameState.observations, the (matches, max_agents) rewards and the
+        (matches,) flags of the matches that ended. Ended matches are reset,
+        and their observations are the initial ones of the next match.
+        """
+        codes = np.asarray(actions)[self.match, self.slot]
+        self._turn(codes)
+        self._move_forward(codes)
+        self._shoot(codes)
+
+        self._spatial_index.rebuild(self.positions, self.alive)
+        agent_rewards = self._advance_shots()
+        np.subtract(self.shooting_delay, 1, out=self.shooting_delay)
+        np.maximum(self.shooting_delay, 0, out=self.shooting_delay)
+        self.ticks += 1
+
+        dones = self._completed_matches()
+        for match in np.flatnonzero(dones).tolist():
+            self._reset_match(match)
+        if dones.any():
+            self._spatial_index.rebuild(self.positions, self.alive)
+
+        rewards = np.zeros((self.num_matches, self.max_agents), dtype=np.float32)
+        rewards[self.match, self.slot] = agent_rewards
+        return self._observations(), rewards, dones
+
+    def _turn(self, codes: np.ndarray):
+        self.headings += np.where(codes == TURN_RIGHT, 1, 0) - np.where(
+            codes == TURN_LEFT, 1, 0
+        )
+        np.mod(self.headings, NUM_HEADINGS, out=self.headings)
+
+    @property
+    def directions(self) -> np.ndarray:
+        """
+        The (agents, 2) unit directions the agents are facing.
+        """
+        return HEADING_DIRECTIONS[self.headings]
+
+    def _move_forward(self, codes: np.ndarray):
+        moving = (codes == FORWARD) & self.alive
+        if not moving.any():
+            return
+
+        new_positions = (
+            self.positions[moving] + self.directions[moving] * PLAYER_FORWARD_DISTANCE
+        )
+        free = ~circles_hit_walls(self.wall_mask, new_positions, PLAYER_DIAMETER / 2)
+        moving[moving] = free
+        self.positions[moving] = new_positions[free]
+
+    def _shoot(self, codes: np.ndarray):
+        shooters = np.flatnonzero(
+            (codes == SHOOT) & self.alive & (self.shooting_delay == 0)
+        )
+        if len(shooters) == 0:
+            return
+
+        self._shot_origins = np.concatenate(
+            [self._shot_origins, self.positions[shooters]]
+        )
+        self._shot_directions = np.concatenate(
+            [self._shot_directions, HEADING_DIRECTIONS[self.headings[shooters]]]
+        )
+        self._shot_shooters = np.concatenate([self._shot_shooters, shooters])
+        self._shot_remaining = np.concatenate(
+            [
+                self._shot_remaining,
+                np.full(len(shooters), PLAYER_SHOOTING_DURATION_TICKS),
+            ]
+        )
+        self.shooting_delay[shooters] = PLAYER_SHOOTING_DELAY_TICKS
+
+    def _advance_shots(self) -> np.ndarray:
+        """
+        Moves every shot by one tick and returns the rewards of the agents,
+        following the rules of GameState._advance_shots.
+        """
+        rewards = np.zeros(len(self.match), dtype=np.float32)
+        if len(self._shot_shooters) == 0:
+            return rewards
+
+        targets, blocked = ProjectileSystem.resolve(
+            self.wall_mask,
+            self._spatial_index,
+            self.positions,
+            self.alive,
+            self._shot_origins,
+            self._shot_directions,
+            self._shot_shooters,
+            PLAYER_SHOOTING_LENGTH_PER_TICK,
+        )
+
+        hit = targets != NO_TARGET
+        killers, victims = self._shot_shooters[hit], targets[hit]
+        same_team = self.team[killers] == self.team[victims]
+        np.add.at(
+            rewards,
+            killers,
+            np.where(same_team, self.TEAM_KILL_REWARD, self.KILL_REWARD),
+        )
+        np.add.at(rewards, victims, self.DEATH_REWARD)
+
+        in_flight = ~blocked & (self._shot_remaining > 1)
+        self._shot_origins = (
+            self._shot_origins[in_flight]
+            + self._shot_directions[in_flight] * PLAYER_SHOOTING_LENGTH_PER_TICK
+        )
+        self._shot_directions = self._shot_directions[in_flight]
+        self._shot_shooters = self._shot_shooters[in_flight]
+        self._shot_remaining = self._shot_remaining[in_flight] - 1
+        return rewards
+
+    def _completed_matches(self) -> np.ndarray:
+        """
+        Matches are over after max_ticks or when at most one team is alive,
+        like in GameSimulation.
+        """
+        alive_teams = np.unique(
+            self.match[self.alive] * self._num_teams + self.team[self.alive]
+        )
+        num_alive_teams = np.bincount(
+            alive_teams // self._num_teams, minlength=self.num_matches
+        )
+        return (self.ticks >= self.max_ticks) | (num_alive_teams <= 1)
+
+    def _observations(self) -> np.ndarray:
+        observations = np.zeros(
+            (
+                self.num_matches,
+                self.max_agents,
+                PLAYER_NUM_RAYS,
+                OBSERVATION_FEATURES,
+            ),
+            dtype=np.float32,
+        )
+        if len(self.match) == 0:
+            return observations
+
+        wall_distances = None
+        if self._wall_visibility is not None:
+            wall_distances = self._wall_visibility.wall_distances(
+                self.positions, self.headings
+            )
+        distances, objects = self.ray_caster.cast(
+            self.wall_mask,
+            self._spatial_index,
+            self.positions,
+            RAY_DIRECTIONS[self.headings],
+            self.alive,
+            self.team,
+            wall_distances=wall_distances,
+        )
+        write_observations(self._agent_observations, distances, objects)
+        observations[self.match, self.slot] = self._agent_observations
+        return observations
@@ -0,0 +1,189 @@
+import argparse
+import hashlib
+import os
+
+import numpy as np
+
+from .constants import PLAYER_NUM_RAYS, PLAYER_RAY_LENGTH, PLAYER_VIEW_FOV
+from .geometry import first_wall_distances
+from .headings import NUM_HEADINGS, RAY_DIRECTIONS
+
+# Part of the cache key, bumped whenever the wall distances are computed
+# differently so that the caches saved before are recomputed
+CACHE_VERSION = 2
+
+
+class WallVisibilityCache:
+    """
+    Distances to the first wall along every ray of the field of view, for
+    positions quantized to a lattice of resolution points per cell and for
+    every heading. Walls never change during a match, so the wall part of a
+    ray is a pure function of (position, heading, ray) and only the agents
+    have to be intersected every tick, up to the cached wall distance.
+
+    Entries are computed lazily, the first time a quantized position and
+    heading is looked up, or up front with precompute. A ray's wall
+    distance is the one from the closest lattice point, so it may be off by
+    up to sqrt(2) / (2 * resolution) from the exact one.
+    """
+
+    DEFAULT_RESOLUTION = 10
+
+    def __init__(self, wall_mask: np.ndarray, resolution: int = DEFAULT_RESOLUTION):
+        self.wall_mask = wall_mask
+        self.resolution = resolution
+        height, width = wall_mask.shape
+        # The lattice spans the cell centers from (0, 0) to (width - 1,
+        # height - 1). Entries are keyed by their flat index in a (y, x,
+        # heading) table of this shape, which is never allocated: _rows only
+        # maps the computed ones to their row of rays in _distances, the
+        # rows being in insertion order.
+        self._shape = (
+            (height - 1) * resolution + 1,
+            (width - 1) * resolution + 1,
+            NUM_HEADINGS,
+        )
+        self._rows: dict[int, int] = {}
+        self._distances = np.empty((0, PLAYER_NUM_RAYS), dtype=np.float16)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def key(self) -> str:
+        """
+        Identifies the walls and ray parameters the cache was computed for.
+        """
+        digest = hashlib.sha256(np.ascontiguousarray(self.wall_mask).tobytes())
+        digest.update(
+            repr(
+                (
+                    CACHE_VERSION,
+                    self.wall_mask.shape,
+                    self.resolution,
+                    NUM_HEADINGS,
+                    PLAYER_NUM_RAYS,
+                    PLAYER_VIEW_FOV,
+                    PLAYER_RAY_LENGTH,
+                )
+            ).encode()
+        )
+        return digest.hexdigest()
+
+    def wall_distances(self, origins: np.ndarray, headings: np.ndarray) -> np.ndarray:
+        """
+        Returns the (agents, PLAYER_NUM_RAYS) distances at which the rays of
+        agents at the (agents, 2) origins, facing the given headings, enter
+        their first wall, or infinity when it is beyond PLAYER_RAY_LENGTH.
+        """
+        cells = np.ravel_multi_index(
+            (*self._quantize(origins), headings), self._shape
+        ).tolist()
+        rows = self._rows
+        missing = [cell for cell in cells if cell not in rows]
+        if missing:
+            self._fill(np.unique(missing))
+        return self._distances[[rows[cell] for cell in cells]].astype(np.float64)
+
+    def precompute(self, batch_size: int = 1 << 12):
+        """
+        Computes the entries of every lattice point outside the walls.
+        """
+        lattice_y, lattice_x = self._shape[:2]
+        xs = np.arange(lattice_x)
+        cells_x = np.rint(xs / self.resolution).astype(np.intp)
+        # One lattice row at a time, to bound the memory used
+        for y in range(lattice_y):
+            cell_y = round(y / self.resolution)
+            free_xs = xs[~self.wall_mask[cell_y, cells_x]]
+            points = y * lattice_x + free_xs
+            cells = (points[:, None] * NUM_HEADINGS + np.arange(NUM_HEADINGS)).ravel()
+            cells = [cell for cell in cells.tolist() if cell not in self._rows]
+            for start in range(0, len(cells), batch_size):
+                self._fill(np.array(cells[start : start + batch_size]))
+
+    def _quantize(self, origins: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        lattice_y, lattice_x = self._shape[:2]
+        xs = np.clip(np.rint(origins[:, 0] * self.resolution), 0, lattice_x - 1)
+        ys = np.clip(np.rint(origins[:, 1] * self.resolution), 0, lattice_y - 1)
+        return ys.astype(np.intp), xs.astype(np.intp)
+
+    def _fill(self, cells: np.ndarray):
+        """
+        Computes the entries of the given keys, none of them being cached.
+        """
+        ys, xs, headings = np.unravel_index(cells, self._shape)
+        origins = np.stack([xs, ys], axis=-1) / self.resolution
+        distances = first_wall_distances(
+            self.wall_mask,
+            origins[:, None, :],
+            RAY_DIRECTIONS[headings],
+            PLAYER_RAY_LENGTH,
+        )
+        size = len(self._rows)
+        self._reserve(size + len(cells))
+        self._distances[size : size + len(cells)] = distances
+        self._rows.update(zip(cells.tolist(), range(size, size + len(cells))))
+
+    def _reserve(self, size: int):
+        if size <= len(self._distances):
+            return
+        distances = np.empty(
+            (max(size, 2 * len(self._distances)), PLAYER_NUM_RAYS), dtype=np.float16
+        )
+        distances[: len(self._rows)] = self._distances[: len(self._rows)]
+        self._distances = distances
+
+    def save(self, path: str):
+        """
+        Writes the computed entries to an .npz file.
+        """
+        size = len(self._rows)
+        np.savez_compressed(
+            path,
+            key=np.array(self.key),
+            cells=np.fromiter(self._rows, dtype=np.int64, count=size),
+            distances=self._distances[:size],
+        )
+
+    @classmethod
+    def load(
+        cls, path: str, wall_mask: np.ndarray, resolution: int = DEFAULT_RESOLUTION
+    ) -> "WallVisibilityCache":
+        """
+        Returns a cache for the walls with the entries saved at path, or an
+        empty one when the file is missing or was saved for other walls or
+        ray parameters.
+        """
+        cache = cls(wall_mask, resolution)
+        if not os.path.exists(path):
+            return cache
+        with np.load(path) as data:
+            if str(data["key"]) != cache.key:
+                return cache
+            cells = data["cells"]
+            cache._reserve(len(cells))
+            cache._distances[: len(cells)] = data["distances"]
+        cache._rows = dict(zip(cells.tolist(), range(len(cells))))
+        return cache
+
+
+def main():
+    from .map import GameMap
+
+    parser = argparse.ArgumentParser(
+        description="Precomputes the wall visibility cache of maps and saves "
+        "it next to each map file."
+    )
+    parser.add_argument("maps", nargs="+")
+    args = parser.parse_args()
+
+    for path in args.maps:
+        game_map = GameMap.from_file(path)
+        game_map.wall_visibility.precompute()
+        game_map.save_wall_visibility()
+        print(f"{path}: {len(game_map.wall_visibility):,} entries")
+
+
+if __name__ == "__main__":
+    main()
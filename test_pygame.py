@@ -6,8 +6,10 @@ from src.agents.player import PlayerAgent
 from src.agents.random_player import RandomPlayerAgent
 from src.agents.tactical_player.tactical_player import TacticalPlayerAgent
 from src.blackboard import Blackboard
+from src.blackboard_backends import LocalBlackboardBackend
 from src.environment import GameEnvironment
 from src.map import GameMap
+from src.ray_casters import NumpyRayCaster
 from src.render_engines import PygameRenderEngine
 from src.simulations.game_simulation import GameSimulation
 from src.state import GameState
@@ -15,7 +17,7 @@ from src.state import GameState
 
 def run_simulation():
     render_engine = PygameRenderEngine(clock_tick=200, sleep_between_simulations=0.001)
-    blackboard = Blackboard()
+    blackboard = Blackboard(backend=LocalBlackboardBackend())
     game_map = GameMap.from_file("maps/level_tactical.txt")
     agents = [
         *[
@@ -36,7 +38,7 @@ def run_simulation():
         ],
         ModeratorAgent(blackboard=blackboard, probability=0.5),
     ]
-    initial_state = GameState(map=game_map)
+    initial_state = GameState(map=game_map, ray_caster=NumpyRayCaster())
     simulation = GameSimulation(
         agents=agents,
         env=GameEnvironment(state=initial_state),